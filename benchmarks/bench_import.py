@@ -0,0 +1,69 @@
+"""
+Import-time regression benchmark for 'import typecheck'.
+
+Runs 'python -X importtime -c "import typecheck"' (needs Python 3.7+)
+several times in fresh interpreters and reports the best cumulative
+import time of the typecheck package.
+Fails if one of the modules typecheck is meant to import lazily
+shows up below typecheck in the import tree or if --max-us is exceeded.
+
+usage: python benchmarks/bench_import.py [--runs N] [--max-us MICROSECONDS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DEFERRED = ("typing", "random", "re", "inspect", "copy", "numpy", "mmap",
+            "http.server", "typecheck.typing_predicates")
+
+
+def importtime_once():
+    """Returns (cumulative microseconds, modules imported for typecheck)."""
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import typecheck"],
+                          cwd=here, stderr=subprocess.PIPE, universal_newlines=True,
+                          check=True)
+    # Lines look like 'import time:  self [us] | cumulative | imported package'
+    # and come in post-order: a package's imports are listed before it.
+    collected = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        collected.append((int(cumulative_us), name))
+        if name.strip() == "typecheck":
+            # everything indented below typecheck was imported on its behalf:
+            depth = len(name) - len(name.lstrip())
+            own = []
+            for cum, other in reversed(collected[:-1]):
+                if len(other) - len(other.lstrip()) <= depth:
+                    break
+                own.append(other.strip())
+            return int(cumulative_us), own
+    raise RuntimeError("typecheck not found in -X importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-us", type=int, default=None,
+                        help="fail if the best cumulative time exceeds this")
+    args = parser.parse_args()
+    if sys.version_info < (3, 7):
+        sys.exit("-X importtime needs Python 3.7 or later")
+    results = [importtime_once() for i in range(args.runs)]
+    best = min(cum for cum, own in results)
+    own = results[0][1]
+    print("import typecheck: best {0} us, median {1} us over {2} runs".format(
+        best, sorted(cum for cum, own in results)[len(results) // 2], args.runs))
+    print("imported on behalf of typecheck: {0}".format(", ".join(sorted(own)) or "-"))
+    failures = [m for m in DEFERRED if m in own]
+    if failures:
+        sys.exit("REGRESSION: imported eagerly: {0}".format(", ".join(failures)))
+    if args.max_us is not None and best > args.max_us:
+        sys.exit("REGRESSION: {0} us > {1} us".format(best, args.max_us))
+
+
+if __name__ == "__main__":
+    main()
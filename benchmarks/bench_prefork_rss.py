@@ -0,0 +1,91 @@
+"""
+Per-worker memory of a pre-fork server with and without tc.warmup().
+
+A master process decorates many functions, optionally calls
+tc.warmup(freeze=True), and forks worker processes that each call every
+function a few times, as if serving requests. Each worker then reports
+how much memory it does not share with the master (Private_Dirty from
+/proc/self/smaps_rollup, Linux only).
+
+usage: python benchmarks/bench_prefork_rss.py [--functions N] [--workers W]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+TEMPLATE = '''
+@tc.typecheck
+def f{0}(a: tc.seq_of(int), b: tc.optional(tc.map_of(str, tc.seq_of(float))),
+         c: tc.map_of(str, tc.list_of(int))) -> tc.any(int, tc.list_of(int)):
+    return a[0]
+'''
+
+
+def private_dirty_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+    raise RuntimeError("no Private_Dirty in smaps_rollup")
+
+
+def master(nfunctions, nworkers, warmup):
+    import typecheck as tc
+    namespace = dict(tc=tc)
+    exec("".join(TEMPLATE.format(i) for i in range(nfunctions)), namespace)
+    functions = [namespace["f%d" % i] for i in range(nfunctions)]
+    if warmup:
+        tc.warmup(freeze=True)
+    results = []
+    for w in range(nworkers):
+        readfd, writefd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # worker: must report and exit, whatever happens
+            try:
+                os.close(readfd)
+                try:
+                    for rounds in range(3):
+                        for f in functions:
+                            f([1, 2, 3], {"x": [1.0]}, {"y": [1, 2]})
+                    result = str(private_dirty_kb())
+                except BaseException as e:
+                    result = "worker failed: {0!r}".format(e)
+                os.write(writefd, result.encode())
+            finally:
+                os._exit(0)
+        os.close(writefd)
+        with os.fdopen(readfd) as r:
+            result = r.read()
+        os.waitpid(pid, 0)
+        if not result.isdigit():
+            raise RuntimeError(result or "worker failed without a result")
+        results.append(int(result))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--functions", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["plain", "warmup"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:  # child run
+        results = master(args.functions, args.workers, args.mode == "warmup")
+        print(" ".join(map(str, results)))
+        return
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)  # the child run imports typecheck from this tree
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+    for mode in ("plain", "warmup"):
+        out = subprocess.check_output([sys.executable, __file__, "--mode", mode,
+                                       "--functions", str(args.functions),
+                                       "--workers", str(args.workers)],
+                                      env=env, universal_newlines=True)
+        kbs = [int(x) for x in out.split()]
+        print("{0:7s}: private dirty per worker: mean {1:7.0f} kB  (min {2}, max {3})".format(
+            mode, sum(kbs) / len(kbs), min(kbs), max(kbs)))
+
+
+if __name__ == "__main__":
+    main()
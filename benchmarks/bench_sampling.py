@@ -0,0 +1,55 @@
+"""
+Per-call cost of checking only some of the calls.
+
+Times calls of a small checked function that checks every call,
+every 100th call, and (for reference) of the undecorated function.
+An unchecked call of a sampled function should cost little more
+than the undecorated call.
+
+usage: python benchmarks/bench_sampling.py [--calls N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# the typecheck package of this tree, also without installing it:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import typecheck as tc
+
+
+def plain(a, b):
+    return a
+
+
+def best_ns(statement, namespace, calls, repeat):
+    timer = timeit.Timer(statement, globals=namespace)
+    return min(timer.repeat(repeat=repeat, number=calls)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    @tc.typecheck
+    def checked(a: int, b: tc.seq_of(str)) -> int:
+        return a
+
+    @tc.typecheck_sampled(every_nth=100)
+    def sampled(a: int, b: tc.seq_of(str)) -> int:
+        return a
+
+    namespace = dict(plain=plain, checked=checked, sampled=sampled, b=["x", "y"])
+    undecorated = best_ns("plain(1, b)", namespace, args.calls, args.repeat)
+    full = best_ns("checked(1, b)", namespace, args.calls, args.repeat)
+    every100 = best_ns("sampled(1, b)", namespace, args.calls, args.repeat)
+    print("undecorated:          {0:8.0f} ns/call".format(undecorated))
+    print("every call checked:   {0:8.0f} ns/call".format(full))
+    print("every 100th checked:  {0:8.0f} ns/call".format(every100))
+
+
+if __name__ == "__main__":
+    main()
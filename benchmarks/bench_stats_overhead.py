@@ -0,0 +1,60 @@
+"""
+Per-call cost of the check statistics, when disabled and when enabled.
+
+Times calls of a trivial checked function without statistics,
+with tc.enable_stats(), and (for reference) undecorated, and
+the test the invocation proxy makes for statistics on each call.
+The cost of disabled statistics is that test: it should be a
+few nanoseconds, i.e. in the noise of the call itself.
+
+usage: python benchmarks/bench_stats_overhead.py [--calls N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# the typecheck package of this tree, also without installing it:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import typecheck as tc
+
+
+def plain(a, b):
+    return a
+
+
+def best_ns(statement, namespace, calls, repeat):
+    timer = timeit.Timer(statement, globals=namespace)
+    return min(timer.repeat(repeat=repeat, number=calls)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    @tc.typecheck
+    def checked(a: int, b: str) -> int:
+        return a
+
+    namespace = dict(plain=plain, checked=checked, cf=checked.__typecheck__)
+    undecorated = best_ns("plain(1, 'b')", namespace, args.calls, args.repeat)
+    off = best_ns("checked(1, 'b')", namespace, args.calls, args.repeat)
+    test = (best_ns("if cf.stats is not None: pass", namespace, args.calls, args.repeat) -
+            best_ns("pass", namespace, args.calls, args.repeat))
+    tc.enable_stats([checked])
+    try:
+        on = best_ns("checked(1, 'b')", namespace, args.calls, args.repeat)
+    finally:
+        tc.disable_stats([checked])
+    print("undecorated:          {0:8.0f} ns/call".format(undecorated))
+    print("checked, stats off:   {0:8.0f} ns/call".format(off))
+    print("checked, stats on:    {0:8.0f} ns/call".format(on))
+    print("stats test per call:  {0:8.1f} ns ({1:.1%} of a checked call)".format(
+        test, test / off))
+
+
+if __name__ == "__main__":
+    main()
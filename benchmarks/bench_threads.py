@@ -0,0 +1,83 @@
+"""
+Throughput of checked calls with 1 to 32 threads.
+
+Each thread calls checked functions (plain classes, seq_of with sampling,
+and checkers created while the threads run) in a tight loop; the
+benchmark reports calls per second for each thread count and the
+speedup over one thread.
+With the GIL, the speedup stays near 1 (the point is that it does not
+collapse through lock contention); on a free-threaded build
+(python3.13t and later) it should grow with the number of cores,
+once this package supports those Python versions (it needs Python < 3.10).
+
+usage: python benchmarks/bench_threads.py [--calls N] [--threads 1,2,4,...]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# the typecheck package of this tree, also without installing it:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import typecheck as tc
+
+
+@tc.typecheck
+def plain(a: int, b: str) -> int:
+    return a
+
+
+@tc.typecheck
+def sampled(a: tc.seq_of(int), b: tc.optional(tc.map_of(str, float))) -> int:
+    return a[0]
+
+
+def undecorated(a: int, b: tc.seq_of(tc.any(int, str))) -> tc.optional(float):
+    return None
+
+
+def worker(calls, barrier):
+    values = list(range(100))
+    mapping = {"x": 1.0}
+    barrier.wait()
+    for i in range(calls):
+        plain(i, "b")
+        sampled(values, mapping)
+        if i % 1000 == 0:  # creating checkers reads the registry concurrently
+            tc.typecheck(undecorated)
+
+
+def run(nthreads, calls):
+    barrier = threading.Barrier(nthreads + 1)
+    threads = [threading.Thread(target=worker, args=(calls // nthreads, barrier))
+               for t in range(nthreads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return (calls // nthreads) * nthreads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000,
+                        help="total calls (of each function) per thread count")
+    parser.add_argument("--threads", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("Python {0}, GIL {1}".format(sys.version.split()[0],
+                                       "enabled" if gil else "disabled"))
+    base = None
+    for nthreads in [int(n) for n in args.threads.split(",")]:
+        rate = run(nthreads, args.calls)
+        base = base or rate
+        print("{0:3d} threads: {1:10.0f} calls/s  speedup {2:5.2f}".format(
+            nthreads, rate, rate / base))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Batch validation of records with tc.Validator.
+
+Validates --records records (default 10**6) against
+{"id": int, "ts": float, "tags": tc.list_of(str)}, once by hand
+(Checker.create() once, a new TypeVarNamespace per record, as one had
+to before tc.Validator existed) and once each with Validator.check_many()
+and Validator.first_failure(), and reports records per second.
+With --workers W, it also runs first_failure() and check_many()
+with W worker processes (threads on Python builds without GIL).
+
+usage: python benchmarks/bench_validator.py [--records N] [--runs R] [--workers W]
+"""
+import argparse
+import os
+import sys
+import time
+
+# the typecheck package of this tree, also without installing it:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import typecheck as tc
+import typecheck.framework as fw
+
+ANNOTATION = {"id": int, "ts": float, "tags": tc.list_of(str)}
+
+
+def by_hand(records):
+    checker = fw.Checker.create(ANNOTATION)
+    return [i for i, record in enumerate(records)
+            if not checker.check(record, fw.TypeVarNamespace())]
+
+
+def check_many(records):
+    return tc.Validator(ANNOTATION).check_many(records)
+
+
+def first_failure(records):
+    return tc.Validator(ANNOTATION).first_failure(records)
+
+
+def in_parallel(workers):
+    def first_failure_parallel(records):
+        return tc.Validator(ANNOTATION).first_failure(records, workers=workers)
+
+    def check_many_parallel(records):
+        return tc.Validator(ANNOTATION).check_many(records, workers=workers)
+
+    return (("first_failure/{0}".format(workers), first_failure_parallel),
+            ("check_many/{0}".format(workers), check_many_parallel))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=10**6)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    records = [{"id": i, "ts": float(i), "tags": ["a", "b", str(i)]}
+               for i in range(args.records)]
+    variants = (("by hand", by_hand), ("check_many", check_many),
+                ("first_failure", first_failure))
+    if args.workers:
+        variants += in_parallel(args.workers)
+    for name, function in variants:
+        best = None
+        for run in range(args.runs):
+            start = time.perf_counter()
+            result = function(records)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        assert not result  # all records are valid
+        print("{0:16s}: {1:8.3f} s  {2:10.0f} records/s".format(
+            name, best, args.records / best))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,32 @@
 # (c) 2014-2016 Lutz Prechelt
 # Distributed under BSD license.
 
-__version__ = "1.3"
+__version__ = "1.4"
 
 from .framework import (TypeCheckError, InputParameterError, ReturnValueError,
                         TypeCheckSpecificationError,
                         optional, disable, enable)
-from .decorators import typecheck, typecheck_with_exceptions
-from .typing_predicates import _dummy  # registers checkers
-from .tc_predicates import (hasattrs, re,
+from .decorators import (typecheck, typecheck_with_exceptions,
+                         typecheck_sampled, typecheck_cache_misses, warmup)
+from .checklevel import checking  # (in a module named checking, it would shadow that)
+from .boundary import enable_boundary_checking, disable_boundary_checking
+from .elision import enable_elision, disable_elision
+from .levels import set_check_level
+from .sampling import Sampling, set_sampling, effective_rates
+from .governor import set_overhead_budget
+from .shadow import enable_shadow_mode, disable_shadow_mode, drain_violations
+from .demotion import (enable_demotion, disable_demotion, demoted_functions,
+                       CheckDemotionWarning)
+from .checkstats import (enable_stats, disable_stats, reset_stats,
+                         stats, stats_report)
+from .metrics import (enable_metrics, disable_metrics,
+                      render_metrics, write_metrics, serve_metrics)
+from .tc_predicates import (hasattrs, re, buffer,
                             seq_of, list_of, map_of,
                             range, enum,
                             any, all, none, anything,
                            )
+from .numpy_predicates import ndarray
+from .validator import Validator
+from .profiling import profile_checks
+from .policy import load_policy, reload_policy, reload_policy_on_signal
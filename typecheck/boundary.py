@@ -0,0 +1,48 @@
+"""
+Boundary-only checking: no checks for calls from trusted modules.
+
+After enable_boundary_checking(["myapp"]), decorated functions in
+myapp (or its submodules) check only the calls that come from modules
+outside myapp, because calls from inside have got their arguments
+checked at the boundary already. The caller is the module whose code
+called the invocation proxy directly; whether its code is trusted is
+decided once per code object.
+tc.checking("full") checks all calls nevertheless.
+"""
+_trusted = ()  # module name prefixes
+_decisions = dict()  # id(code object) -> (code object, whether code from it is trusted)
+_MAX_DECISIONS = 10000  # (code objects may be created dynamically)
+
+
+def is_trusted(module):
+    if not module:
+        return False
+    return any(module == prefix or module.startswith(prefix + ".") for prefix in _trusted)
+
+
+def trusted_caller(frame):
+    """Whether the code of frame comes from a trusted module."""
+    code = frame.f_code
+    entry = _decisions.get(id(code))  # (code objects compare by value, not by module)
+    if entry is None:
+        if len(_decisions) >= _MAX_DECISIONS:
+            _decisions.clear()
+        entry = _decisions[id(code)] = (code, is_trusted(frame.f_globals.get("__name__")))
+    return entry[1]
+
+
+def enable_boundary_checking(trusted):
+    """
+    Makes decorated functions (present and future) in the modules with the
+    names in trusted (or their submodules) skip checks for calls from those.
+    """
+    global _trusted
+    import typecheck.decorators as tcd
+    _trusted = tuple(trusted)
+    _decisions.clear()
+    for checked in tcd.checked_functions():
+        checked.boundary = is_trusted(checked.module)
+
+
+def disable_boundary_checking():
+    enable_boundary_checking(())
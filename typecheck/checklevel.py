@@ -0,0 +1,59 @@
+"""
+Checking levels for regions of code:
+
+    with tc.checking("off"):
+        run_batch()  # decorated functions called in here check nothing
+
+"full" checks all calls (regardless of sampling), "sampled" (the level
+outside of any tc.checking()) checks the calls selected by each
+function's sampling, if any, and "off" checks no calls.
+The level follows threads and asyncio tasks: it is kept in a context
+variable (a thread-local variable before Python 3.7).
+The invocation proxy reads it via current_level(), but only once
+checking() has been used at all (see used), as that read is comparatively slow.
+"""
+import contextlib
+
+OFF = "off"
+SAMPLED = "sampled"
+FULL = "full"
+LEVELS = (OFF, SAMPLED, FULL)
+used = False  # whether checking() has ever been called; before, the level is SAMPLED
+
+try:
+    import contextvars
+except ImportError:  # Python < 3.7
+    import _thread
+    _local = _thread._local()
+
+    def current_level():
+        return _local.__dict__.get("level", SAMPLED)
+
+    def _set_level(level):
+        previous = current_level()
+        _local.level = level
+        return previous
+
+    def _reset_level(previous):
+        _local.level = previous
+else:
+    _level = contextvars.ContextVar("typecheck_level", default=SAMPLED)
+    current_level = _level.get
+    _set_level = _level.set
+    _reset_level = _level.reset
+
+
+@contextlib.contextmanager
+def checking(level=FULL):
+    """Sets the checking level for the with statement, see above."""
+    if level not in LEVELS:
+        import typecheck.framework as fw
+        raise fw.TypeCheckSpecificationError(
+            "level must be one of {0}, not {1!r}".format(", ".join(LEVELS), level))
+    global used
+    used = True  # (never reset: tasks and threads may have inherited the level)
+    token = _set_level(LEVELS[LEVELS.index(level)])  # the constant: fast comparisons
+    try:
+        yield
+    finally:
+        _reset_level(token)
@@ -0,0 +1,194 @@
+"""
+Opt-in statistics of the calls of @typecheck-decorated functions.
+
+After enable_stats(), each call of a decorated function records
+whether its checks failed and how long the argument checks,
+the function body, and the result check took.
+stats() returns these data, stats_report() renders them as a table.
+While statistics are disabled, the only cost is one test per call.
+"""
+import _thread
+import collections
+import time
+
+import typecheck.shadow as sh
+
+PHASES = ("args", "body", "result")
+RECENT = 1000  # durations kept per phase for computing percentiles
+
+_enabled = False  # whether functions decorated from now on get FunctionStats
+_metrics = None  # the metrics file of this process, see typecheck.metrics
+_governor = None  # the overhead budget in effect, see typecheck.governor
+_demotion = None  # the automatic demotion in effect, see typecheck.demotion
+
+
+class FunctionStats:
+    """Call counts and timings of one decorated function."""
+    def __init__(self, name):
+        self.name = name
+        self._lock = _thread.allocate_lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.recent = {phase: collections.deque(maxlen=RECENT) for phase in PHASES}
+
+    def record(self, durations, failed):
+        """durations holds seconds (or None: phase not reached) per PHASES."""
+        with self._lock:
+            self.calls += 1
+            self.failures += bool(failed)
+            for phase, duration in zip(PHASES, durations):
+                if duration is not None:
+                    self.totals[phase] += duration
+                    self.recent[phase].append(duration)
+        metrics = _metrics
+        if metrics is not None:
+            checks = (durations[0] or 0.0) + (durations[2] or 0.0)
+            metrics.add(self.name, failed, int(checks * 1e9))
+        governor = _governor
+        if governor is not None:
+            governor.tick()
+        demotion = _demotion
+        if demotion is not None:
+            demotion.tick()
+
+    def counts(self):
+        """Returns (calls, failures, check seconds, body seconds) so far."""
+        with self._lock:
+            return (self.calls, self.failures,
+                    self.totals["args"] + self.totals["result"], self.totals["body"])
+
+    def as_dict(self):
+        with self._lock:
+            result = dict(calls=self.calls, failures=self.failures)
+            for phase in PHASES:
+                recent = sorted(self.recent[phase])
+                result[phase] = dict(total=self.totals[phase],
+                                     p50=_percentile(recent, 0.50),
+                                     p90=_percentile(recent, 0.90),
+                                     p99=_percentile(recent, 0.99))
+        return result
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[int(round(fraction * (len(ordered) - 1)))]
+
+
+def timed_call(checked, method, namespace, args, kwargs):
+    """What the invocation proxy does, plus recording checked.stats."""
+    clock = time.perf_counter
+    durations = [None, None, None]
+    phase = 0  # index of the running phase in PHASES
+    failed = False
+    shadow = checked.shadow  # violations are recorded rather than raised
+    recorded = shadow and sh.recorded_in_thread()
+    start = clock()
+    try:
+        checked.check_args(args, kwargs, namespace)
+        durations[0] = clock() - start
+        failed = shadow and sh.recorded_in_thread() != recorded
+        phase = 1
+        start = clock()
+        result = method(*args, **kwargs)
+        durations[1] = clock() - start
+        if checked.check_result is not None:
+            phase = 2
+            recorded = shadow and sh.recorded_in_thread()  # (the body may have added some)
+            start = clock()
+            checked.check_result(result, namespace)
+            durations[2] = clock() - start
+            failed = failed or shadow and sh.recorded_in_thread() != recorded
+        return result
+    except BaseException:
+        durations[phase] = clock() - start
+        failed = phase != 1  # a check has failed (rather than the function)
+        raise
+    finally:
+        checked.stats.record(durations, failed)
+
+################################################################################
+
+def enable_stats(functions=None):
+    """
+    Starts recording statistics for the given decorated functions
+    or, by default, for all decorated functions, present and future.
+    """
+    global _enabled
+    import typecheck.decorators as tcd
+    if functions is None:
+        _enabled = True
+    for checked in tcd.selected_functions(functions):
+        if checked.stats is None:
+            checked.stats = FunctionStats(checked.fullname)
+
+
+def disable_stats(functions=None):
+    """Stops recording (and forgets) the statistics, like enable_stats()."""
+    global _enabled
+    import typecheck.decorators as tcd
+    if functions is None:
+        _enabled = False
+    for checked in tcd.selected_functions(functions):
+        checked.stats = None
+
+
+def reset_stats():
+    import typecheck.decorators as tcd
+    for checked in tcd.checked_functions():
+        if checked.stats is not None:
+            checked.stats.reset()
+
+
+def stats():
+    """
+    Returns a dict from the full name of each function with statistics
+    to a dict with entries 'calls', 'failures', and, for each phase
+    'args', 'body', and 'result', a dict of the 'total', 'p50', 'p90',
+    and 'p99' of its durations in seconds (percentiles of recent calls).
+    """
+    import typecheck.decorators as tcd
+    return {checked.fullname: checked.stats.as_dict()
+            for checked in tcd.checked_functions() if checked.stats is not None}
+
+
+def _check_share(s):
+    checks = s["args"]["total"] + s["result"]["total"]
+    return checks / ((checks + s["body"]["total"]) or 1.0)
+
+
+SORT_KEYS = {
+    "calls": lambda s: s["calls"],
+    "failures": lambda s: s["failures"],
+    "checks": lambda s: s["args"]["total"] + s["result"]["total"],
+    "body": lambda s: s["body"]["total"],
+    "share": _check_share,  # of the checks in the total time
+}
+
+
+def stats_report(sort="checks", limit=None):
+    """
+    Returns the statistics as a text table, one line per function,
+    in descending order of sort (one of SORT_KEYS), at most limit lines.
+    Times are in microseconds.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError("sort must be one of {0}".format(", ".join(sorted(SORT_KEYS))))
+    data = sorted(stats().items(), key=lambda item: SORT_KEYS[sort](item[1]),
+                  reverse=True)[:limit]
+    lines = ["{0:>9} {1:>8} {2:>10} {3:>8} {4:>8} {5:>10} {6:>10} {7:>6}  {8}".format(
+        "calls", "failures", "checks_us", "args_p50", "args_p99",
+        "result_us", "body_us", "share", "function")]
+    for name, s in data:
+        lines.append("{0:9d} {1:8d} {2:10.0f} {3:8.1f} {4:8.1f} {5:10.0f} {6:10.0f} "
+                     "{7:5.0%}  {8}".format(
+                         s["calls"], s["failures"],
+                         1e6 * (s["args"]["total"] + s["result"]["total"]),
+                         1e6 * s["args"]["p50"], 1e6 * s["args"]["p99"],
+                         1e6 * s["result"]["total"], 1e6 * s["body"]["total"],
+                         _check_share(s), name))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,224 @@
+"""
+Ahead-of-time compilation of @typecheck wrappers.
+
+usage: python -m typecheck.compile [-v] package_or_module ...
+
+imports the given packages (including all their subpackages and
+submodules), finds all @typecheck-decorated functions and writes, per
+source file, a module of specialized check functions with the checks
+inlined as plain Python into the __pycache__ directory next to the source.
+Whenever typecheck() decorates a function later, it uses the precompiled
+check functions if they exist and still fit, and the generic ones otherwise.
+
+The precompiled code fixes only the layout of a function's checks
+(which parameters are checked, in what way); the checkers themselves are
+still built from the annotations at decoration time.
+A precompiled entry is used only if the function is found at the same
+qualified name and line and its layout fingerprint is unchanged, so
+edited annotations fall back to the generic checks automatically.
+So do all functions of a wrappers file that was written by another
+version of typecheck or Python, or that cannot be executed at all.
+"""
+import os
+import sys
+
+import typecheck.framework as fw
+
+SUFFIX = ".typecheck-wrappers.py"
+
+_loaded = dict()  # source filename -> dict of key -> (fingerprint, factory), or None
+
+
+def compiled_check_functions(checked):
+    """
+    Returns (check_args, check_result) from the precompiled wrappers
+    for CheckedFunction checked, or None if there is no fitting one.
+    """
+    code = getattr(checked.method, "__code__", None)
+    if code is None:
+        return None
+    filename = code.co_filename
+    if filename not in _loaded:
+        _loaded[filename] = _load(filename)
+    wrappers = _loaded[filename]
+    if not wrappers:
+        return None
+    entry = wrappers.get(_key(checked))
+    if entry is None or entry[0] != fingerprint(checked):
+        return None  # function or annotations changed since compilation
+    return entry[1](checked, fw.Checker.no_value)
+
+
+def wrapperpath(sourcefile):
+    sourcefile = os.path.abspath(sourcefile)
+    basename = os.path.splitext(os.path.basename(sourcefile))[0]
+    return os.path.join(os.path.dirname(sourcefile), "__pycache__", basename + SUFFIX)
+
+
+def _load(sourcefile):
+    try:
+        with open(wrapperpath(sourcefile), "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, ValueError):
+        return None  # not compiled (or e.g. "<string>")
+    namespace = dict()
+    try:
+        exec(compile(source, wrapperpath(sourcefile), "exec"), namespace)
+    except Exception:
+        return None  # damaged or foreign file: use the generic checks
+    wrappers = namespace.get("WRAPPERS")
+    if namespace.get("VERSIONS") != _versions() or not isinstance(wrappers, dict):
+        return None  # stale: recompile
+    return wrappers
+
+
+def _versions():
+    import typecheck
+    return [typecheck.__version__, sys.version]
+
+
+def _key(checked):
+    return "{0}:{1}".format(checked.qualname, checked.method.__code__.co_firstlineno)
+
+
+def _kind(checker):
+    # plain class checks are inlined, everything else is called:
+    return "type" if type(checker) is fw.TypeChecker else "call"
+
+
+def fingerprint(checked):
+    """Describes the layout of a CheckedFunction's checks as a string."""
+    return repr((list(checked.argnames),
+                 [d and (d[0], _kind(d[1])) for d in checked.arg_checkers],
+                 [(n, _kind(c)) for n, c in checked.kwarg_checkers.items()],
+                 checked.return_checker and _kind(checked.return_checker)))
+
+################################################################################
+
+def _binding(kind, var, expression):
+    if kind == "type":
+        return "    {0} = {1}._cls".format(var, expression)
+    return "    {0} = {1}.check".format(var, expression)
+
+
+def _test(kind, var):
+    if kind == "type":
+        return "issubclass(type(value), {0})".format(var)
+    return "{0}(value, namespace)".format(var)
+
+
+def generate(checked, factoryname):
+    """Returns the source code of the check functions factory for checked."""
+    lines = ["def {0}(checked, no_value):".format(factoryname),
+             "    input_error = checked.input_error",
+             "    return_error = checked.return_error"]
+    positionals = [(i, d[0], d[1]) for i, d in enumerate(checked.arg_checkers) if d]
+    kwonlies = list(enumerate(checked.kwarg_checkers.items()))
+    for i, name, checker in positionals:
+        lines.append(_binding(_kind(checker), "a%d" % i,
+                              "checked.arg_checkers[{0}][1]".format(i)))
+    for j, (name, checker) in kwonlies:
+        lines.append(_binding(_kind(checker), "k%d" % j,
+                              "checked.kwarg_checkers[{0!r}]".format(name)))
+    if checked.return_checker is not None:
+        lines.append(_binding(_kind(checked.return_checker), "r",
+                              "checked.return_checker"))
+    lines.append("")
+    lines.append("    def check_args(args, kwargs, namespace):")
+    lines.append("        nargs = len(args)")
+    for i, name, checker in positionals:
+        lines += ["        if nargs > {0}:".format(i),
+                  "            value = args[{0}]".format(i),
+                  "            if not {0}:".format(_test(_kind(checker), "a%d" % i)),
+                  "                input_error({0!r}, value)".format(name)]
+    if positionals:
+        lines.append("        if kwargs:")
+        for i, name, checker in positionals:
+            lines += ["            value = kwargs.get({0!r}, no_value)".format(name),
+                      "            if value is not no_value and not {0}:".format(
+                          _test(_kind(checker), "a%d" % i)),
+                      "                input_error({0!r}, value)".format(name)]
+    for j, (name, checker) in kwonlies:
+        lines += ["        value = kwargs.get({0!r}, no_value)".format(name),
+                  "        if not {0}:".format(_test(_kind(checker), "k%d" % j)),
+                  "            input_error({0!r}, value)".format(name)]
+    lines.append("")
+    if checked.return_checker is None:
+        lines.append("    return check_args, None")
+    else:
+        lines += ["    def check_result(value, namespace):",
+                  "        if not {0}:".format(_test(_kind(checked.return_checker), "r")),
+                  "            return_error(value)",
+                  "",
+                  "    return check_args, check_result"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_module(sourcefile, checkeds):
+    """Returns the source code of the wrappers module for one source file."""
+    parts = ["# Generated by 'python -m typecheck.compile' from {0}\n"
+             "# Do not edit; recompile instead.\n"
+             "VERSIONS = {1!r}  # typecheck and Python\n".format(sourcefile, _versions())]
+    entries = []
+    for nr, checked in enumerate(sorted(checkeds, key=_key)):
+        factoryname = "_factory{0}".format(nr)
+        parts.append(generate(checked, factoryname))
+        entries.append("    {0!r}: ({1!r}, {2}),".format(_key(checked),
+                                                         fingerprint(checked),
+                                                         factoryname))
+    parts.append("WRAPPERS = {\n" + "\n".join(entries) + "\n}\n")
+    return "\n\n".join(parts)
+
+
+def compile_modules(modulenames, verbose=False):
+    """
+    Imports the modules and packages (recursively) and writes the wrapper
+    modules for all decorated functions defined in them.
+    Returns the list of files written.
+    """
+    import importlib
+    import pkgutil
+    import typecheck.decorators as tcd
+    modules = []
+    for modulename in modulenames:
+        module = importlib.import_module(modulename)
+        modules.append(module)
+        if hasattr(module, "__path__"):
+            for info in pkgutil.walk_packages(module.__path__, modulename + "."):
+                modules.append(importlib.import_module(info[1]))
+    sourcefiles = set(os.path.abspath(m.__file__) for m in modules
+                      if getattr(m, "__file__", None))
+    by_file = dict()
+    for checked in tcd.checked_functions():
+        code = getattr(checked.method, "__code__", None)
+        if code and os.path.abspath(code.co_filename) in sourcefiles:
+            by_file.setdefault(code.co_filename, []).append(checked)
+    written = []
+    for sourcefile, checkeds in sorted(by_file.items()):
+        path = wrapperpath(sourcefile)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generate_module(sourcefile, checkeds))
+        _loaded.pop(sourcefile, None)
+        written.append(path)
+        if verbose:
+            print("{0}: {1} functions".format(path, len(checkeds)))
+    return written
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m typecheck.compile",
+                                     description="Precompile @typecheck wrappers.")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("modules", nargs="+", metavar="package_or_module")
+    args = parser.parse_args(argv)
+    written = compile_modules(args.modules, verbose=args.verbose)
+    if not written:
+        print("no @typecheck-decorated functions found", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
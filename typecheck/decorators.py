@@ -1,12 +1,32 @@
+import _thread
 import functools
-import inspect
-import typing as tg
+import sys
+import weakref
 
+import typecheck.boundary as bd
+import typecheck.checklevel as ck
+import typecheck.checkstats as cs
+import typecheck.elision as el
 import typecheck.framework as fw
+import typecheck.levels as lv
+import typecheck.policy as po
+import typecheck.sampling as sm
+import typecheck.shadow as sh
+import typecheck.signature as sg
 
 def typecheck(method, *, input_parameter_error=fw.InputParameterError,
-              return_value_error=fw.ReturnValueError):
-    argspec = inspect.getfullargspec(method)
+              return_value_error=fw.ReturnValueError, sampling=None,
+              cache_misses_only=False):
+    if _is_lru_cache(method):
+        if cache_misses_only:
+            return _checked_within_cache(method, input_parameter_error,
+                                         return_value_error, sampling)
+        argspec = sg.getfullargspec(method.__wrapped__)  # the wrapper has no signature
+    elif cache_misses_only:
+        raise fw.TypeCheckSpecificationError(
+            "{0} is not wrapped by functools.lru_cache".format(method.__name__))
+    else:
+        argspec = sg.getfullargspec(method)
     argnames = argspec.args
     if not argspec.annotations or not fw._enabled:
         return method
@@ -14,7 +34,6 @@ def typecheck(method, *, input_parameter_error=fw.InputParameterError,
     default_arg_count = len(argspec.defaults or [])
     non_default_arg_count = len(argnames) - default_arg_count
 
-    method_name = method.__name__
     arg_checkers = [None] * len(argnames)
     kwarg_checkers = {}
     return_checker = None
@@ -46,56 +65,293 @@ def typecheck(method, *, input_parameter_error=fw.InputParameterError,
             arg_checkers[i] = (n, checker)
 
 
+    checked = CheckedFunction(method, argnames, arg_checkers, kwarg_checkers,
+                              return_checker, input_parameter_error,
+                              return_value_error, sampling)
+    has_self = len(argnames) > 0 and argnames[0] == 'self'
+    current_level, OFF, SAMPLED, FULL = ck.current_level, ck.OFF, ck.SAMPLED, ck.FULL
+    getframe, trusted_caller = sys._getframe, bd.trusted_caller
+
     def typecheck_invocation_proxy(*args, **kwargs):
-        # TODO: '.' not in method_name  for methods. Why not?
-        if len(argnames) > 0 and argnames[0] == 'self':
+        level = current_level() if ck.used else SAMPLED  # see tc.checking()
+        if level is not FULL:
+            if level is OFF:
+                return method(*args, **kwargs)
+            if checked.boundary and trusted_caller(getframe(1)):
+                return method(*args, **kwargs)
+            if checked.countdown > 0:  # (not atomic: approximate under threads)
+                checked.countdown -= 1
+                return method(*args, **kwargs)
+            if checked.sampler is not None:
+                checked.countdown = checked.sampler.gap()
+        # TODO: '.' not in checked.name  for methods. Why not?
+        if has_self:
             theself = args[0]  # call to instance method
         else:
             theself = None  # call to function, static method, or class method
         namespace = fw.TypeVarNamespace(theself)
+        if checked.stats is not None:  # all that statistics cost when disabled
+            return cs.timed_call(checked, method, namespace, args, kwargs)
+        checked.check_args(args, kwargs, namespace)
+        # Call method-proper:
+        result = method(*args, **kwargs)
+        # Check result type:
+        if checked.check_result is not None:
+            checked.check_result(result, namespace)
+        return result
+    #-- end of proxy method
+
+    typecheck_invocation_proxy.__typecheck__ = checked
+    for name in _CACHE_METHODS:  # of functools.lru_cache
+        if hasattr(method, name):
+            setattr(typecheck_invocation_proxy, name, getattr(method, name))
+    # __qualname__ makes the proxy pickle by reference (as method would):
+    return functools.update_wrapper(typecheck_invocation_proxy, method,
+                                    assigned=("__name__", "__qualname__",
+                                              "__module__", "__doc__"))
+
+
+_CACHE_METHODS = ("cache_info", "cache_clear", "cache_parameters")
+
+
+def _is_lru_cache(method):
+    return (hasattr(method, "cache_info") and hasattr(method, "__wrapped__") and
+            not hasattr(method, "__typecheck__"))  # not checked already
+
+
+def _checked_within_cache(cached, input_parameter_error, return_value_error, sampling):
+    """
+    Returns a new lru_cache (like cached) of the checked function cached wraps,
+    so that only cache misses are checked. The entries already in cached are
+    not carried over. The new cache is typed, whatever cached was: a hit
+    requires arguments of the same types as those of the checked call, so
+    that f(1.0) is not answered, unchecked, from the entry of f(1).
+    Arguments the cache cannot hash are checked before the cache's
+    TypeError is passed on, so wrong-typed ones give input_parameter_error.
+    """
+    function = cached.__wrapped__
+    checked_function = typecheck(function, input_parameter_error=input_parameter_error,
+                                 return_value_error=return_value_error, sampling=sampling)
+    if checked_function is function:
+        return cached  # nothing to check
+    if hasattr(cached, "cache_parameters"):  # Python 3.9+
+        maxsize = cached.cache_parameters()["maxsize"]
+    else:
+        maxsize = cached.cache_info().maxsize
+    cache = functools.lru_cache(maxsize, typed=True)(checked_function)
+    checked = checked_function.__typecheck__
+    has_self = len(checked.argnames) > 0 and checked.argnames[0] == 'self'
+
+    def typecheck_cache_proxy(*args, **kwargs):
+        try:
+            return cache(*args, **kwargs)
+        except TypeError:
+            if _hashable(args, kwargs):
+                raise  # not from the cache
+            namespace = fw.TypeVarNamespace(args[0] if has_self and args else None)
+            checked.check_args(args, kwargs, namespace)
+            raise  # well-typed, but unhashable: as the cache alone would do
+
+    typecheck_cache_proxy.__typecheck__ = checked
+    for name in _CACHE_METHODS:
+        if hasattr(cache, name):
+            setattr(typecheck_cache_proxy, name, getattr(cache, name))
+    return functools.update_wrapper(typecheck_cache_proxy, function,
+                                    assigned=("__name__", "__qualname__",
+                                              "__module__", "__doc__"))
+
+
+def _hashable(args, kwargs):
+    try:
+        hash((args, tuple(kwargs.values())))
+    except TypeError:
+        return False
+    return True
+
+################################################################################
+
+_checked_functions = weakref.WeakSet()  # all CheckedFunctions in existence
+_checked_functions_lock = _thread.allocate_lock()  # decorating may happen in any thread
+
+
+def checked_functions():
+    """Returns the CheckedFunction objects of all decorated functions alive."""
+    with _checked_functions_lock:
+        return list(_checked_functions)
+
+
+def selected_functions(functions=None):
+    """The CheckedFunction objects of the given decorated functions (None: of all)."""
+    if functions is None:
+        return checked_functions()
+    return [f.__typecheck__ for f in functions]
+
+
+def warmup(modules=None, freeze=True):
+    """
+    For pre-fork servers: call this in the master process before forking.
+    Imports the given modules (names or module objects; default: none)
+    and builds all lazily built checker state of the functions decorated
+    in those modules (default: of all decorated functions) right now,
+    so that the workers need not build it each on their own.
+    With freeze=True, the checkers are then frozen (see Checker.freeze())
+    and, where available (Python 3.7+), gc.freeze() moves all objects
+    existing so far into the permanent generation so that garbage
+    collections in the workers do not touch (and thus copy) their pages.
+    (Reference counting copies the pages of the objects a worker uses
+    all the same, so this saves little memory; see the README.)
+    Returns the number of decorated functions warmed up.
+    """
+    import importlib
+    names = []
+    for module in modules or ():
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        names.append(module.__name__)
+    count = 0
+    for checked in checked_functions():
+        if modules is not None and not any(checked.module == name or
+                                           checked.module.startswith(name + ".")
+                                           for name in names):
+            continue
+        for checker in checked.checkers():
+            if freeze:
+                checker.freeze()
+            else:
+                checker.prepare()
+        count += 1
+    if freeze:
+        import gc
+        if hasattr(gc, "freeze"):
+            gc.freeze()
+    return count
+
+
+class CheckedFunction:
+    """
+    The checking machinery of one @typecheck-decorated function.
+    check_args(args, kwargs, namespace) and check_result(result, namespace)
+    apply the checkers to a call and raise the appropriate exception
+    upon a violation (in shadow mode: record it, see typecheck.shadow).
+    They come either from a precompiled wrapper module
+    (see typecheck.compile) or from make_check_functions().
+    """
+    def __init__(self, method, argnames, arg_checkers, kwarg_checkers,
+                 return_checker, input_parameter_error, return_value_error,
+                 sampling=None):
+        self.method = method
+        self.name = method.__name__
+        self.module = method.__module__
+        self.qualname = getattr(method, "__qualname__", self.name)
+        self.fullname = "{0}.{1}".format(self.module, self.qualname)
+        self.stats = cs.FunctionStats(self.fullname) if cs._enabled else None
+        self.shadow = sh._enabled  # record violations rather than raise
+        self.boundary = bd.is_trusted(self.module)  # whether trusted callers skip checks
+        self.elide = el._enabled  # whether values that have passed are not re-checked
+        self.argnames = argnames
+        self.declared_checkers = (arg_checkers, kwarg_checkers, return_checker)
+        self.input_parameter_error = input_parameter_error
+        self.return_value_error = return_value_error
+        self.own_sampling = sampling  # from the decorator (or a demotion), if any
+        self.set_sampling(sampling or sm._policy)
+        self.own_level = None  # content check level set for this function
+        self.set_level(lv.effective_level(self))
+        self.policy_undo = dict()  # see typecheck.policy
+        if po._rules:
+            po.apply(self)
+        with _checked_functions_lock:
+            _checked_functions.add(self)
+
+    def set_level(self, level):
+        """Makes the checks work at content check level 1, 2, or 3 (see typecheck.levels)."""
+        arg_checkers, kwarg_checkers, return_checker = self.declared_checkers
+        if level != lv.DEFAULT_LEVEL:
+            arg_checkers = [d and (d[0], d[1].degrade(level)) for d in arg_checkers]
+            kwarg_checkers = {n: c.degrade(level) for n, c in kwarg_checkers.items()}
+            return_checker = return_checker and return_checker.degrade(level)
+        if self.elide:
+            arg_checkers, kwarg_checkers, return_checker = el.eliding_checkers(
+                self, arg_checkers, kwarg_checkers, return_checker, level)
+        self.arg_checkers = arg_checkers  # (name, checker) or None per position
+        self.kwarg_checkers = kwarg_checkers  # kwonly name -> checker
+        self.return_checker = return_checker
+        self.level = level
+        import typecheck.compile as tcc  # not at the top: see 'python -m typecheck.compile'
+        self.check_args, self.check_result = (
+            level == lv.DEFAULT_LEVEL and tcc.compiled_check_functions(self) or
+            make_check_functions(self))
+
+    def set_sampling(self, sampling):
+        """Starts checking the calls selected by sampling (None: all calls)."""
+        self.sampler = sampling.sampler(self.fullname) if sampling else None
+        self.countdown = self.sampler.first_gap() if sampling else 0  # calls to skip
+
+    def checkers(self):
+        """Returns the top-level checkers of the function."""
+        result = [d[1] for d in self.arg_checkers if d is not None]
+        result.extend(self.kwarg_checkers.values())
+        if self.return_checker is not None:
+            result.append(self.return_checker)
+        return result
+
+    def input_error(self, arg_name, value):
+        if self.shadow:
+            return sh.record(self.fullname, arg_name, value)
+        raise self.input_parameter_error(
+            "{0}() has got an incompatible value "
+            "for {1}: {2}".format(self.name, arg_name, _displayed(value)))
+
+    def return_error(self, result):
+        if self.shadow:
+            return sh.record(self.fullname, "return", result)
+        raise self.return_value_error(
+            "{0}() has returned an incompatible "
+            "value: {1}".format(self.name, _displayed(result)))
+
+
+def _displayed(value):
+    return str(value) == "" and "''" or value
+
+
+def make_check_functions(checked):
+    """Returns the generic (check_args, check_result) for a CheckedFunction."""
+    arg_checkers = checked.arg_checkers
+    kwarg_checkers = checked.kwarg_checkers
+    return_checker = checked.return_checker
+    input_error = checked.input_error
+    no_value = fw.Checker.no_value
+
+    def check_args(args, kwargs, namespace):
         # Validate positional parameters:
         for declaration, arg in zip(arg_checkers, args):
             if declaration is not None:
                 arg_name, checker = declaration
                 if not checker.check(arg, namespace):
-                    raise input_parameter_error(
-                        "{0}() has got an incompatible value "
-                        "for {1}: {2}".format(method_name, arg_name,
-                                              str(arg) == "" and "''" or arg))
+                    input_error(arg_name, arg)
         # Validate named parameters:
-        for declaration in arg_checkers:
-            if declaration is not None:
-                arg_name, checker = declaration
-                kwarg = kwargs.get(arg_name, fw.Checker.no_value)
-                if kwarg != fw.Checker.no_value:
-                    if not checker.check(kwarg, namespace):
-                        raise input_parameter_error(
-                            "{0}() has got an incompatible value "
-                            "for {1}: {2}".format(method_name, arg_name,
-                                                  str(
-                                                      kwarg) == "" and "''" or kwarg))
+        if kwargs:
+            for declaration in arg_checkers:
+                if declaration is not None:
+                    arg_name, checker = declaration
+                    kwarg = kwargs.get(arg_name, no_value)
+                    if kwarg is not no_value and not checker.check(kwarg, namespace):
+                        input_error(arg_name, kwarg)
         # Validate kwonly named parameters:
         for arg_name, checker in kwarg_checkers.items():
-            kwarg = kwargs.get(arg_name, fw.Checker.no_value)
+            kwarg = kwargs.get(arg_name, no_value)
             if not checker.check(kwarg, namespace):
-                raise input_parameter_error("{0}() has got an incompatible value "
-                                            "for {1}: {2}".format(method_name,
-                                                                  arg_name,
-                                                                  str(
-                                                                      kwarg) == "" and "''" or kwarg))
-        # Call method-proper:
-        result = method(*args, **kwargs)
-        # Check result type:
-        if (return_checker is not None and
-                not return_checker.check(result, namespace)):
-            raise return_value_error("{0}() has returned an incompatible "
-                                     "value: {1}".format(method_name, str(
-                result) == "" and "''" or result))
-        return result
-    #-- end of proxy method
+                input_error(arg_name, kwarg)
 
-    return functools.update_wrapper(typecheck_invocation_proxy, method,
-                                    assigned=("__name__", "__module__", "__doc__"))
+    if return_checker is None:
+        return check_args, None
+
+    return_error = checked.return_error
+
+    def check_result(result, namespace):
+        if not return_checker.check(result, namespace):
+            return_error(result)
+
+    return check_args, check_result
 
 ################################################################################
 
@@ -110,6 +366,17 @@ def typecheck_with_exceptions(*,
                                     input_parameter_error=input_parameter_error,
                                     return_value_error=return_value_error)
 
+
+def typecheck_cache_misses(method):
+    """Like typecheck, for lru_cache-wrapped functions: checks cache misses only."""
+    return typecheck(method, cache_misses_only=True)
+
+
+def typecheck_sampled(*, sample_rate=None, every_nth=None, first_n=0, seed=None):
+    """Like typecheck, but checks only the calls selected as in sampling.Sampling."""
+    sampling = sm.Sampling(sample_rate, every_nth, first_n, seed)
+    return lambda method: typecheck(method, sampling=sampling)
+
 ################################################################################
 
 # TODO: @dynamictypecheck as @typecheck plus @typing.no_type_check:
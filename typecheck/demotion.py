@@ -0,0 +1,87 @@
+"""
+Automatic sampling for functions whose checks dominate their run time.
+
+After enable_demotion(ratio=5.0), the check statistics of all decorated
+functions are recorded and each function, once it has had warmup_calls
+checked calls, is looked at once: if its checks took more than ratio
+times as long as its body, it is demoted to checking only sample_rate
+of its calls (0.0: none). Each round of demotions issues one warning
+naming the functions; demoted_functions() lists all of them.
+"""
+import _thread
+import collections
+import time
+import warnings
+import weakref
+
+import typecheck.checkstats as cs
+import typecheck.sampling as sm
+
+DemotedFunction = collections.namedtuple("DemotedFunction", "name ratio sampling")
+
+
+class CheckDemotionWarning(RuntimeWarning):
+    pass
+
+
+_demoted = []  # DemotedFunctions, in the order of their demotion
+
+
+class _Demotion:
+    def __init__(self, ratio, warmup_calls, sample_rate, interval):
+        self.ratio = ratio
+        self.warmup_calls = warmup_calls
+        self.sampling = sm.Sampling(sample_rate=sample_rate)
+        self.interval = interval
+        self._judged = weakref.WeakSet()  # CheckedFunctions looked at
+        self._lock = _thread.allocate_lock()
+        self._next = time.perf_counter() + interval
+
+    def tick(self):
+        """Called after each checked call; judges functions once per interval."""
+        if time.perf_counter() >= self._next and self._lock.acquire(False):
+            try:
+                self.judge()
+            finally:
+                self._lock.release()
+
+    def judge(self):
+        import typecheck.decorators as tcd
+        self._next = time.perf_counter() + self.interval
+        demoted = []
+        for checked in tcd.checked_functions():
+            if (checked in self._judged or checked.stats is None or
+                    checked.own_sampling is not None):
+                continue
+            calls, failures, check_time, body_time = checked.stats.counts()
+            if calls < self.warmup_calls:
+                continue
+            self._judged.add(checked)
+            ratio = check_time / body_time if body_time else float("inf")
+            if ratio > self.ratio:
+                checked.own_sampling = self.sampling  # as if given to the decorator
+                checked.set_sampling(self.sampling)
+                demoted.append(DemotedFunction(checked.fullname, ratio, self.sampling))
+        if demoted:
+            _demoted.extend(demoted)
+            warnings.warn("checking only {0:.1%} of the calls of these functions, whose "
+                          "checks take more than {1} times as long as they do: {2}".format(
+                              self.sampling.sample_rate, self.ratio,
+                              ", ".join(d.name for d in demoted)),
+                          CheckDemotionWarning)
+
+
+def enable_demotion(ratio=5.0, warmup_calls=1000, sample_rate=0.01, interval=1.0):
+    """Starts demoting functions as described at the top of this module."""
+    cs.enable_stats()
+    cs._demotion = _Demotion(ratio, warmup_calls, sample_rate, interval)
+
+
+def disable_demotion():
+    """Stops demoting further functions; the demoted ones stay demoted."""
+    cs._demotion = None
+
+
+def demoted_functions():
+    """Returns a list of DemotedFunction(name, ratio, sampling), one per demotion."""
+    return list(_demoted)
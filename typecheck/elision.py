@@ -0,0 +1,109 @@
+"""
+Elision of re-checks: values that have passed a check already.
+
+A checked function often forwards a validated argument unchanged to
+another checked function with the same annotation, or returns it under
+an identical return annotation. For functions with elision enabled,
+all parameters (and results) whose annotation is the identical object
+(e.g. a module-level alias such as UserIds = tg.Tuple[int, ...]) and
+that are checked at the same level share a small record of the values
+that have passed; a value found there is not checked again.
+Only immutable values are recorded (instances of the exact types in
+IMMUTABLE, and tuples and frozensets of those), so a value modified in
+between is always checked anew, and only for pure checkers (see
+Checker.pure), whose verdict cannot change for such a value.
+Values longer than MAX_LEN are not recorded, lest the records keep
+large values alive.
+Plain class checks are left alone: they cost less than the lookup.
+"""
+import typecheck.framework as fw
+
+IMMUTABLE = frozenset((int, float, complex, bool, str, bytes, type(None)))
+_enabled = False  # whether functions decorated from now on elide re-checks
+_CAPACITY = 256  # values recorded per annotation and level
+MAX_LEN = 256  # of recorded strings, bytes, tuples, and frozensets
+_records = dict()  # (id(annotation), level) -> (annotation, dict of id(value) -> value)
+
+
+def _immutable(value):
+    valuetype = type(value)
+    if valuetype is tuple or valuetype is frozenset:
+        return (len(value) <= MAX_LEN and
+                IMMUTABLE.issuperset(map(type, value)) and
+                not any(len(v) > MAX_LEN for v in value if type(v) in (str, bytes)))
+    if valuetype is str or valuetype is bytes:
+        return len(value) <= MAX_LEN
+    return valuetype in IMMUTABLE
+
+
+class _ElidingChecker(fw.Checker):
+    """A checker that skips the values recorded as having passed it."""
+    pure = True
+
+    def __init__(self, checker, verified):
+        self._checker = checker
+        self._verified = verified  # shared by all checkers of the same annotation and level
+
+    def check(self, value, namespace):
+        verified = self._verified
+        if verified.get(id(value)) is value:
+            return True
+        if not self._checker.check(value, namespace):
+            return False
+        if _immutable(value):
+            if len(verified) >= _CAPACITY:
+                verified.clear()
+            verified[id(value)] = value  # (keeps the id from being reused)
+        return True
+
+
+def _eliding(checker, annotation, level):
+    """checker, made eliding if that can pay off."""
+    if checker is None or type(checker) is fw.TypeChecker:
+        return checker
+    checker.prepare()  # e.g. TypeVar checkers may be built lazily
+    if not all(c.pure for c in checker.walk()):
+        return checker
+    key = (id(annotation), level)
+    record = _records.get(key)
+    if record is None:
+        record = _records.setdefault(key, (annotation, dict()))  # keeps the id valid
+    return _ElidingChecker(checker, record[1])
+
+
+def eliding_checkers(checked, arg_checkers, kwarg_checkers, return_checker, level):
+    """The checkers of CheckedFunction checked, made eliding where possible."""
+    annotations = checked.method.__annotations__
+    arg_checkers = [d and (d[0], _eliding(d[1], annotations[d[0]], level))
+                    for d in arg_checkers]
+    kwarg_checkers = {n: _eliding(c, annotations[n], level) for n, c in kwarg_checkers.items()}
+    return_checker = _eliding(return_checker, annotations.get("return"), level)
+    return arg_checkers, kwarg_checkers, return_checker
+
+################################################################################
+
+def enable_elision(functions=None):
+    """
+    Makes the given decorated functions (by default: all, present and
+    future) skip checks of values that have passed them already, see above.
+    """
+    global _enabled
+    import typecheck.decorators as tcd
+    if functions is None:
+        _enabled = True
+    for checked in tcd.selected_functions(functions):
+        if not checked.elide:
+            checked.elide = True
+            checked.set_level(checked.level)
+
+
+def disable_elision(functions=None):
+    """Makes the functions check every value again, like enable_elision()."""
+    global _enabled
+    import typecheck.decorators as tcd
+    if functions is None:
+        _enabled = False
+    for checked in tcd.selected_functions(functions):
+        if checked.elide:
+            checked.elide = False
+            checked.set_level(checked.level)
@@ -1,6 +1,6 @@
+import _thread  # not threading, which would make 'import typecheck' slow
 import collections
-import inspect
-import typing as tg
+import sys
 
 ################################################################################
 
@@ -30,8 +30,14 @@ class ReturnValueError(TypeCheckError): pass
 
 ################################################################################
 
+def _isclass(annotation):
+    return isinstance(annotation, type)  # what inspect.isclass does
+
+
 def _is_GenericMeta_class(annotation):
-    return (inspect.isclass(annotation) and
+    # a GenericMeta can only exist if somebody has imported typing:
+    tg = sys.modules.get("typing")
+    return (tg is not None and _isclass(annotation) and
             type(annotation) == tg.GenericMeta)
 
 class TypeVarNamespace:
@@ -46,8 +52,13 @@ class TypeVarNamespace:
     The latter is stored as attribute NS_ATTRIBUTE in the class instance itself.
     Most TypeVarNamespace objects will never be used after their creation.
     is_compatible() implements bound, covariance, and contravariance logic.
+    The instance-level bindings are shared by all threads calling methods
+    of the instance; is_compatible() updates them atomically, so each
+    check sees one consistent binding and concurrent bindings end up in
+    the most general type just as sequential ones would.
     """
     NS_ATTRIBUTE = '__tc_bindings__'
+    _instance_lock = _thread.RLock()  # for updates of any instance-level bindings
 
     def __init__(self, instance=None):
         """_instance is the self of the method call if the class is a tg.Generic"""
@@ -56,12 +67,17 @@ class TypeVarNamespace:
         self._instance_ns = (self._instance and
                              self._instance.__dict__.get(self.NS_ATTRIBUTE))
 
+    def clear(self):
+        """Forgets the call-level bindings, so the namespace can serve another call."""
+        self._ns.clear()
+
     def bind(self, typevar, its_type):
         """
         Binds typevar to the type its_type.
         Binding occurs on the instance if the typevar is a TypeVar of the
         generic type of the instance, on call level otherwise.
         """
+        import typing as tg
         assert type(typevar) == tg.TypeVar
         if self.is_generic_in(typevar):
             self.bind_to_instance(typevar, its_type)
@@ -76,8 +92,9 @@ class TypeVarNamespace:
 
     def bind_to_instance(self, typevar, its_type):
         if self._instance_ns is None:  # we've not bound something previously:
-            self._instance.__setattr__(self.NS_ATTRIBUTE, dict())
-            self._instance_ns = self._instance.__dict__[self.NS_ATTRIBUTE]
+            # another thread may have done so meanwhile; setdefault keeps theirs:
+            self._instance_ns = self._instance.__dict__.setdefault(
+                self.NS_ATTRIBUTE, dict())
         self._instance_ns[typevar] = its_type
 
     def is_bound(self, typevar):
@@ -103,6 +120,15 @@ class TypeVarNamespace:
         rebind the type variable to supertypes of the current binding several
         times until the required most general binding is found.
         """
+        if self._instance is not None and self.is_generic_in(typevar):
+            with self._instance_lock:  # binding check and update in one step
+                if self._instance_ns is None:
+                    self._instance_ns = self._instance.__dict__.get(self.NS_ATTRIBUTE)
+                return self._is_compatible(typevar, its_type)
+        return self._is_compatible(typevar, its_type)
+
+    def _is_compatible(self, typevar, its_type):
+        import typing as tg
         binding = self.binding_of(typevar)  # may or may not exist
         if binding is None:
             self.bind(typevar, its_type)  # initial binding, OK
@@ -126,9 +152,18 @@ class Checker:
         def __str__(self):
             return "<no value>"
 
+        def __reduce__(self):
+            return (getattr, (Checker, "no_value"))  # stays a singleton
+
     no_value = NoValue()
 
+    # _registered and _deferred are never modified, only replaced (under
+    # _registry_lock), so that create() can read them without locking:
     _registered = []
+    _deferred = []  # (trigger, modulename) of not-yet-imported registrations
+    _importing = ()  # the _deferred entries being imported right now
+    _prepended = []  # the register(prepend=True) entries not from _deferred modules
+    _registry_lock = _thread.RLock()  # reentrant: see _load_deferred()
 
     @classmethod
     def register(cls, predicate, factory, prepend=False):
@@ -139,16 +174,52 @@ class Checker:
         The checker type is normally added after the existing ones,
         but 'prepend' makes it come first.
         """
-        if prepend:
-            cls._registered.insert(0, (predicate, factory))
-        else:
-            cls._registered.append((predicate, factory))
+        with cls._registry_lock:
+            if prepend:
+                if not cls._importing:  # must stay ahead of deferred registrations
+                    cls._prepended = [(predicate, factory)] + cls._prepended
+                cls._registered = [(predicate, factory)] + cls._registered
+            else:
+                cls._registered = cls._registered + [(predicate, factory)]
+
+    @classmethod
+    def register_deferred(cls, trigger, modulename):
+        """
+        Arranges for module modulename (whose import performs register()
+        calls) to be imported only once it is needed, namely before
+        the first create(annot) for which trigger(annot) is true.
+        """
+        with cls._registry_lock:
+            cls._deferred = cls._deferred + [(trigger, modulename)]
+
+    @classmethod
+    def _load_deferred(cls, annotation):
+        """Imports the deferred modules whose trigger fires (all if annotation is None)."""
+        with cls._registry_lock:
+            due = [d for d in cls._deferred if d not in cls._importing and
+                   (annotation is None or d[0](annotation))]
+            if not due:
+                return
+            # the entries stay in _deferred until their registrations are
+            # complete, so create() in other threads comes here and waits:
+            cls._importing = cls._importing + tuple(due)
+            try:
+                for trigger, modulename in due:
+                    __import__(modulename)
+            finally:
+                cls._importing = tuple(d for d in cls._importing if d not in due)
+                cls._deferred = [d for d in cls._deferred if d not in due]
+                # keep the order 'import typecheck' had (before the deferring):
+                cls._registered = cls._prepended + [r for r in cls._registered
+                                                    if r not in cls._prepended]
 
     @classmethod
     def create(cls, annotation_or_checker):
         if isinstance(annotation_or_checker, cls):
             return annotation_or_checker  # is a checker already
         annotation = annotation_or_checker
+        if cls._deferred:
+            cls._load_deferred(annotation)
         for predicate, factory in cls._registered:
             if predicate(annotation):
                 return factory(annotation)
@@ -158,10 +229,110 @@ class Checker:
     def __call__(self, value, namespace):
         return self.check(value, namespace)
 
+    _frozen = False  # see freeze()
+
+    # whether check() depends on nothing but the value (not on TypeVar
+    # bindings or the state of the world); checkers must declare it,
+    # see typecheck.elision:
+    pure = False
+
+    def children(self):
+        """
+        Returns the checkers this one delegates to.
+        By default, these are found among the attributes of the checker:
+        checkers, and tuples, lists, or dict values of checkers.
+        """
+        result = []
+        for value in self.__dict__.values():
+            if isinstance(value, Checker):
+                result.append(value)
+            elif isinstance(value, (tuple, list)):
+                result.extend(v for v in value if isinstance(v, Checker))
+            elif isinstance(value, dict):
+                result.extend(v for v in value.values() if isinstance(v, Checker))
+        return result
+
+    def walk(self):
+        """Yields this checker and all its direct and indirect children."""
+        yield self
+        for child in self.children():
+            yield from child.walk()
+
+    def prepare(self):
+        """
+        Builds whatever state this checker (or any of its children)
+        would otherwise build lazily when first used.
+        """
+        for child in self.children():
+            child.prepare()
+
+    def freeze(self):
+        """
+        prepare()s the checker tree and marks it frozen, so that checkers
+        that would change themselves when used refrain from it and their
+        memory pages stay shared by processes fork()ed later.
+        Of the built-in checkers, only tc.re (its match cache) does that.
+        """
+        self.prepare()
+        for checker in self.walk():
+            checker._frozen = True
+
+    check_class = None  # see degrade()
+
+    def degrade(self, level):
+        """
+        Returns a checker for content check level 1 (checks only the
+        outermost class of values), 2 (checks like this one), or
+        3 (checks all content, rather than a sample of it).
+        Checkers that check content define check_class(value), the
+        part of check() that looks only at the class (and cheap properties
+        such as the length) of the value, for level 1.
+        Other checkers degrade their children (in a copy of themselves).
+        """
+        if level == 2 or not self.children():
+            return self
+        if level == 1 and self.check_class is not None:
+            return _ClassOnlyChecker(self.check_class)
+        return self._with_degraded_children(level)
+
+    def _with_degraded_children(self, level):
+        """A copy of this checker with the children found by children() degraded."""
+        def degraded(value):
+            return value.degrade(level) if isinstance(value, Checker) else value
+        result = self._copy()
+        for name, value in self.__dict__.items():
+            if isinstance(value, Checker):
+                result.__dict__[name] = value.degrade(level)
+            elif isinstance(value, (tuple, list)) and any(isinstance(v, Checker) for v in value):
+                result.__dict__[name] = type(value)(degraded(v) for v in value)
+            elif isinstance(value, dict) and any(isinstance(v, Checker) for v in value.values()):
+                result.__dict__[name] = {k: degraded(v) for k, v in value.items()}
+        return result
+
+
+    def _copy(self):
+        """A shallow copy (copy.copy() would use the __reduce__ of some checkers)."""
+        result = object.__new__(type(self))
+        result.__dict__.update(self.__dict__)
+        return result
+
+
+class _ClassOnlyChecker(Checker):
+    """A content checker degraded to content check level 1."""
+    pure = True
+
+    def __init__(self, check_class):
+        self._check_class = check_class  # a bound method of the content checker
+
+    def check(self, value, namespace):
+        return self._check_class(value)
+
 
 ################################################################################
 
 class TypeChecker(Checker):
+    pure = True
+
     def __init__(self, cls):
         self._cls = cls
 
@@ -170,11 +341,23 @@ class TypeChecker(Checker):
         return issubclass(type(value), self._cls)
 
 # Note: 'typing'-module checkers must register _before_ this one:
-Checker.register(inspect.isclass, TypeChecker)
+Checker.register(_isclass, TypeChecker)
+
+
+def _may_be_typing_annotation(annotation):
+    # typing annotations cannot exist before somebody imported typing,
+    # except for forward references, which are plain strings:
+    return "typing" in sys.modules or type(annotation) == str
+
+# typing_predicates is imported (and registers its checkers) on first need:
+Checker.register_deferred(_may_be_typing_annotation,
+                          "typecheck.typing_predicates")
 
 ################################################################################
 
 class optional(Checker):
+    pure = True
+
     def __init__(self, check):
         self._check = Checker.create(check)
 
@@ -189,16 +372,29 @@ def _is_sequence(annotation):
     return isinstance(annotation, collections.Sequence)
 
 
+def _is_tg_tuple_class(cls):
+    """issubclass(cls, tg.Tuple), but importing typing only for tuple types."""
+    if cls is tuple:
+        return True
+    if not issubclass(cls, tuple):
+        return False
+    import typing as tg
+    return issubclass(cls, tg.Tuple)
+
+
 class FixedSequenceChecker(Checker):
+    pure = True
+
     def __init__(self, the_sequence):
         self._cls = type(the_sequence)
+        self._is_tg_tuple = _is_tg_tuple_class(self._cls)
         self._checks = tuple(Checker.create(x) for x in iter(the_sequence))
 
     def check(self, values, namespace):
         """specifying a plain tuple allows arguments that are tuples or lists;
         specifying a specialized (subclassed) tuple allows only that type;
         specifying a list allows only that list type."""
-        is_tuplish_type = (issubclass(self._cls, tg.Tuple) or
+        is_tuplish_type = (self._is_tg_tuple or
                            issubclass(type(values), self._cls))
         if (not _is_sequence(values) or not is_tuplish_type or
                 len(values) != len(self._checks)):
@@ -208,6 +404,11 @@ class FixedSequenceChecker(Checker):
                 return False
         return True
 
+    def check_class(self, values):
+        return (_is_sequence(values) and
+                (self._is_tg_tuple or issubclass(type(values), self._cls)) and
+                len(values) == len(self._checks))
+
 
 Checker.register(_is_sequence, FixedSequenceChecker)
 
@@ -0,0 +1,170 @@
+"""
+Sampling rates that keep the time spent in checks within a budget.
+
+After set_overhead_budget(0.02), the check statistics of all decorated
+functions are recorded and, every interval seconds, the governor
+estimates from them how often each function is called and how long its
+checks and its body take per call. It then divides the check time
+the budget allows among the functions: each gets an equal share, and
+functions whose checks need less than that (and so are checked fully)
+leave the rest to the others, whose sampling rates make their checks
+take just their share. So cheap checks are not sampled because of
+expensive ones elsewhere. Functions whose checks have failed recently
+are exempt from sampling; functions with a sampling of their own are
+left alone. The rates rise by at most a factor of two per interval.
+Besides checked calls, a background thread triggers the adjustments,
+so they continue when few calls are checked; it ends as soon as the
+governor is replaced.
+"""
+import _thread
+import os
+import time
+import weakref
+
+import typecheck.checkstats as cs
+import typecheck.sampling as sm
+
+MIN_RATE = 0.001  # even the most expensive checks are done this often
+
+
+class _FunctionState:
+    def __init__(self):
+        self.rate = 1.0
+        self.counts = (0, 0, 0.0, 0.0)  # checked.stats.counts() at the last adjust()
+        self.calls = 0.0  # estimated calls per interval
+        self.check_time = 0.0  # per checked call
+        self.body_time = 0.0  # per call
+        self.violated_until = 0.0
+
+
+class _Governor:
+    def __init__(self, budget, interval, violation_hold, min_rate, seed):
+        self.budget = budget
+        self.interval = interval
+        self.violation_hold = violation_hold
+        self.min_rate = min_rate
+        self.seed = seed
+        self._states = weakref.WeakKeyDictionary()  # CheckedFunction -> _FunctionState
+        self._lock = _thread.allocate_lock()
+        self._next = time.perf_counter() + interval
+        self._pid = None  # of the process the background thread runs in
+        self._start_lock = _thread.allocate_lock()
+        import threading  # deferred to keep 'import typecheck' fast
+        self._stopped = threading.Event()
+
+    def tick(self):
+        """Called after each checked call; adjusts the rates once per interval."""
+        if self._pid != os.getpid() and self._start_lock.acquire(False):
+            try:  # (non-blocking: a fork()ed copy of the lock may stay locked)
+                if self._pid != os.getpid():  # e.g. in a fork()ed worker
+                    self._pid = os.getpid()
+                    self._start_thread()
+            finally:
+                self._start_lock.release()
+        if time.perf_counter() >= self._next and self._lock.acquire(False):
+            try:
+                self.adjust()
+            finally:
+                self._lock.release()
+
+    def stop(self):
+        """Ends the background thread (of this process)."""
+        self._stopped.set()
+
+    def _start_thread(self):
+        import threading
+        thread = threading.Thread(target=self._run, name="typecheck governor")
+        thread.daemon = True
+        thread.start()
+
+    def _run(self):
+        """The background thread: ticks until stop()."""
+        while not self._stopped.wait(max(self.interval, 0.01)):
+            self.tick()
+
+    def adjust(self):
+        import typecheck.decorators as tcd
+        now = time.perf_counter()
+        self._next = now + self.interval
+        governed, violated = [], []
+        priority_demand = body_time = 0.0  # seconds per interval
+        for checked in tcd.checked_functions():
+            if checked.own_sampling is not None or checked.stats is None:
+                continue
+            state = self._states.get(checked)
+            if state is None:
+                state = self._states[checked] = _FunctionState()
+            counts = checked.stats.counts()
+            if counts[0] < state.counts[0]:  # after reset_stats()
+                state.counts = (0, 0, 0.0, 0.0)
+            calls, failures, check_time, body = [new - old for new, old
+                                                 in zip(counts, state.counts)]
+            state.counts = counts
+            if failures:
+                state.violated_until = now + self.violation_hold
+            if calls:
+                state.calls = calls / state.rate
+                state.check_time = check_time / calls
+                state.body_time = body / calls
+            else:  # too few calls to see any checked one: assume fewer calls
+                state.calls /= 2
+            body_time += state.calls * state.body_time
+            if state.violated_until > now:
+                priority_demand += state.calls * state.check_time
+                violated.append((checked, state))
+            else:
+                governed.append((checked, state))
+        allowed = self.budget / (1.0 - self.budget) * body_time - priority_demand
+        rates = _allocated(allowed, [state.calls * state.check_time
+                                     for checked, state in governed])
+        for (checked, state), rate in zip(governed, rates):
+            newrate = min(max(self.min_rate, rate), 2 * state.rate)
+            self._set_rate(checked, state, newrate)
+        for checked, state in violated:
+            self._set_rate(checked, state, 1.0)
+
+    def _set_rate(self, checked, state, newrate):
+        if newrate != state.rate:
+            state.rate = newrate
+            checked.set_sampling(
+                None if newrate >= 1.0 else sm.Sampling(sample_rate=newrate, seed=self.seed))
+
+
+def _allocated(allowed, demands):
+    """
+    The sampling rates for the check demands (seconds per interval) that
+    make them add up to at most allowed: each demand gets an equal share,
+    and what the smaller demands leave of theirs goes to the larger ones.
+    """
+    rates = [1.0] * len(demands)
+    remaining = max(allowed, 0.0)
+    order = sorted(range(len(demands)), key=demands.__getitem__)
+    for k, i in enumerate(order):
+        share = remaining / (len(order) - k)
+        if demands[i] > share:
+            for j in order[k:]:
+                rates[j] = share / demands[j]
+            break
+        remaining -= demands[i]
+    return rates
+
+
+def set_overhead_budget(budget, interval=1.0, violation_hold=60.0,
+                        min_rate=MIN_RATE, seed=None):
+    """
+    Keeps the checks within the share budget (e.g. 0.02) of the time
+    spent in decorated functions by sampling their calls; see above.
+    Functions whose checks failed are checked fully for violation_hold
+    seconds afterwards. budget=None ends this (statistics stay enabled).
+    """
+    import typecheck.decorators as tcd
+    governor, cs._governor = cs._governor, None
+    if governor is not None:
+        governor.stop()
+    for checked in tcd.checked_functions():
+        if checked.own_sampling is None:  # the governor starts from full checking
+            checked.set_sampling(sm._policy if budget is None else None)
+    if budget is not None:
+        assert 0.0 < budget < 1.0
+        cs.enable_stats()
+        cs._governor = _Governor(budget, interval, violation_hold, min_rate, seed)
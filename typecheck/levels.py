@@ -0,0 +1,55 @@
+"""
+Content check levels of decorated functions:
+1 checks only the outermost class of each argument and result,
+2 (the default) checks content as the annotations say (often a sample),
+3 checks all content. See Checker.degrade().
+Levels can be set for all decorated functions, per module
+(including its submodules), and per function; the most specific wins.
+"""
+DEFAULT_LEVEL = 2
+LEVELS = (1, 2, 3)
+
+_global_level = DEFAULT_LEVEL
+_module_levels = dict()  # module name -> level
+
+
+def effective_level(checked):
+    """The content check level that applies to CheckedFunction checked."""
+    if checked.own_level is not None:
+        return checked.own_level
+    module = checked.module
+    while module:  # the innermost module with a level wins
+        if module in _module_levels:
+            return _module_levels[module]
+        module = module.rpartition(".")[0]
+    return _global_level
+
+
+def set_check_level(level, modules=None, functions=None):
+    """
+    Sets the content check level (see above) of the given decorated
+    functions, or else of the given modules (names), or else of all
+    decorated functions, present and future. level=None removes the
+    level of the functions or modules again.
+    """
+    global _global_level
+    import typecheck.decorators as tcd
+    import typecheck.framework as fw
+    if level is not None and level not in LEVELS:
+        raise fw.TypeCheckSpecificationError(
+            "the check level must be 1, 2, or 3, not {0!r}".format(level))
+    if functions is not None:
+        for function in functions:
+            function.__typecheck__.own_level = level
+    elif modules is not None:
+        for module in modules:
+            if level is None:
+                _module_levels.pop(module, None)
+            else:
+                _module_levels[module] = level
+    else:
+        _global_level = DEFAULT_LEVEL if level is None else level
+    for checked in tcd.checked_functions():
+        newlevel = effective_level(checked)
+        if newlevel != checked.level:
+            checked.set_level(newlevel)
@@ -0,0 +1,280 @@
+"""
+Check statistics of many processes (e.g. the workers of a pre-fork
+server), aggregated and exported in the Prometheus text format.
+
+After enable_metrics(directory), each process adds the checked calls,
+check failures, and check nanoseconds of each decorated function to
+its own memory-mapped file in directory. Each file has a single
+writer, so the processes need no locking among each other.
+render_metrics(directory) sums up all files of the directory,
+write_metrics() and serve_metrics() publish the result.
+Whenever a process starts its file, the files of terminated processes
+are merged into a single file (MERGED), so they do not pile up and the
+sums do not decrease; this needs POSIX file locks (module fcntl),
+without which the files of terminated processes are kept.
+"""
+import _thread
+import contextlib
+import os
+import struct
+
+import typecheck.checkstats as cs
+
+_INITIAL_SIZE = 1 << 16
+_HEADER = struct.Struct("<Q")  # bytes used in the file
+_LENGTH = struct.Struct("<I")  # of an entry's name, which is padded to 8 bytes
+_VALUES = struct.Struct("<QQQ")  # checked calls, failures, check nanoseconds
+_PREFIX = "typecheck_"
+_SUFFIX = ".db"
+MERGED = _PREFIX + "merged" + _SUFFIX  # the counters of terminated processes
+_LOCKFILE = "typecheck.lock"
+
+
+class _MetricsFile:
+    """The counters of one process."""
+    def __init__(self, directory):
+        import mmap  # lazily, like everything not needed by 'import typecheck'
+        self.directory = directory
+        self.pid = os.getpid()
+        self._lock = _thread.allocate_lock()
+        self._offsets = dict()  # function name -> offset of its values
+        with _directory_lock(directory, exclusive=True) as locked:
+            if locked:
+                _merge_terminated(directory)
+            self._file = open(os.path.join(directory, "{0}{1}{2}".format(
+                _PREFIX, self.pid, _SUFFIX)), "w+b")
+        self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), _INITIAL_SIZE)
+        self._used = _HEADER.size
+        _HEADER.pack_into(self._map, 0, self._used)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def add(self, name, failed, check_ns):
+        if self.pid != os.getpid():  # we are a forked child: start our own file
+            return _reopened(self).add(name, failed, check_ns)
+        with self._lock:
+            offset = self._offsets.get(name)
+            if offset is None:
+                offset = self._new_entry(name)
+            calls, failures, nanoseconds = _VALUES.unpack_from(self._map, offset)
+            _VALUES.pack_into(self._map, offset, calls + 1, failures + bool(failed),
+                              nanoseconds + check_ns)
+
+    def _new_entry(self, name):
+        encoded = name.encode("utf-8")
+        padded = (_LENGTH.size + len(encoded) + 7) // 8 * 8
+        size = padded + _VALUES.size
+        if self._used + size > len(self._map):
+            newsize = 2 * len(self._map)
+            while self._used + size > newsize:
+                newsize *= 2
+            import mmap
+            self._map.close()
+            self._file.truncate(newsize)
+            self._map = mmap.mmap(self._file.fileno(), newsize)
+        entry = self._used
+        _LENGTH.pack_into(self._map, entry, len(encoded))
+        self._map[entry + _LENGTH.size:entry + _LENGTH.size + len(encoded)] = encoded
+        _VALUES.pack_into(self._map, entry + padded, 0, 0, 0)
+        self._used += size
+        _HEADER.pack_into(self._map, 0, self._used)  # readers see complete entries only
+        self._offsets[name] = entry + padded
+        return entry + padded
+
+
+def _read(path):
+    """Yields (function name, values) for the entries of a metrics file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return  # being created
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    offset = _HEADER.size
+    while offset < used:
+        length = _LENGTH.unpack_from(data, offset)[0]
+        name = data[offset + _LENGTH.size:offset + _LENGTH.size + length].decode("utf-8")
+        offset += (_LENGTH.size + length + 7) // 8 * 8
+        yield name, _VALUES.unpack_from(data, offset)
+        offset += _VALUES.size
+
+
+def _write(path, totals):
+    """Writes a metrics file with the values of dict totals (atomically)."""
+    data = bytearray(_HEADER.size)
+    for name, values in sorted(totals.items()):
+        encoded = name.encode("utf-8")
+        padded = (_LENGTH.size + len(encoded) + 7) // 8 * 8
+        entry = bytearray(padded + _VALUES.size)
+        _LENGTH.pack_into(entry, 0, len(encoded))
+        entry[_LENGTH.size:_LENGTH.size + len(encoded)] = encoded
+        _VALUES.pack_into(entry, padded, *values)
+        data += entry
+    _HEADER.pack_into(data, 0, len(data))
+    temporary = "{0}.{1}.tmp".format(path, os.getpid())
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def _totals(paths):
+    """function name -> [calls, failures, nanoseconds], summed over the files."""
+    result = dict()
+    for path in paths:
+        for name, values in _read(path):
+            sums = result.setdefault(name, [0, 0, 0])
+            for i, value in enumerate(values):
+                sums[i] += value
+    return result
+
+
+def _files(directory):
+    return [os.path.join(directory, filename) for filename in sorted(os.listdir(directory))
+            if filename.startswith(_PREFIX) and filename.endswith(_SUFFIX)]
+
+
+@contextlib.contextmanager
+def _directory_lock(directory, exclusive):
+    """Locks the files of directory among processes; yields whether it could."""
+    try:
+        import fcntl
+    except ImportError:  # not POSIX
+        yield False
+        return
+    with open(os.path.join(directory, _LOCKFILE), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield True  # (closing the file releases the lock)
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # e.g. a process of another user
+    return True
+
+
+def _merge_terminated(directory):
+    """
+    Adds the files of terminated processes (including an earlier one with
+    our pid) to MERGED and removes them. Needs the directory locked exclusively.
+    """
+    terminated = []
+    for path in _files(directory):
+        pid = os.path.basename(path)[len(_PREFIX):-len(_SUFFIX)]
+        if pid.isdigit() and (int(pid) == os.getpid() or not _is_running(int(pid))):
+            terminated.append(path)
+    if not terminated:
+        return
+    merged = os.path.join(directory, MERGED)
+    _write(merged, _totals(([merged] if os.path.exists(merged) else []) + terminated))
+    for path in terminated:
+        os.remove(path)
+
+################################################################################
+
+def enable_metrics(directory, functions=None):
+    """
+    Starts adding the statistics of the given decorated functions
+    (by default: all, see enable_stats()) of this process, and
+    of processes forked from it, to the metrics files in directory.
+    """
+    disable_metrics()
+    os.makedirs(directory, exist_ok=True)
+    cs._metrics = _MetricsFile(directory)
+    cs.enable_stats(functions)
+
+
+def disable_metrics():
+    """Stops adding to the metrics files; statistics stay enabled."""
+    metrics = cs._metrics
+    cs._metrics = None
+    if metrics is not None and metrics.pid == os.getpid():
+        metrics.close()
+
+
+_reopen_lock = _thread.allocate_lock()
+
+
+def _after_fork_in_child():
+    # another thread of the parent may have held these locks at fork():
+    global _reopen_lock
+    _reopen_lock = _thread.allocate_lock()
+    if cs._metrics is not None:
+        cs._metrics._lock = _thread.allocate_lock()
+
+if hasattr(os, "register_at_fork"):  # Python 3.7+; before, fork only while no thread checks
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _reopened(metrics):
+    """The metrics file of this forked child of metrics' process."""
+    with _reopen_lock:
+        if cs._metrics is metrics:  # not yet replaced by another thread
+            cs._metrics = _MetricsFile(metrics.directory)
+        return cs._metrics or metrics
+
+
+def _escaped(name):
+    return name.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+_FAMILIES = (
+    ("typecheck_checked_calls_total", "Calls of @typecheck-decorated functions."),
+    ("typecheck_check_failures_total", "Calls with failed argument or result checks."),
+    ("typecheck_check_seconds_total", "Time spent checking arguments and results."),
+)
+
+
+def render_metrics(directory):
+    """Returns the sums over all metrics files in directory in Prometheus text format."""
+    with _directory_lock(directory, exclusive=False):  # no merge in between
+        totals = _totals(_files(directory))
+    lines = []
+    for i, (family, helptext) in enumerate(_FAMILIES):
+        lines.append("# HELP {0} {1}".format(family, helptext))
+        lines.append("# TYPE {0} counter".format(family))
+        for name in sorted(totals):
+            value = totals[name][i]
+            lines.append("{0}{{function=\"{1}\"}} {2}".format(
+                family, _escaped(name), value / 1e9 if i == 2 else value))
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(directory, path):
+    """Writes render_metrics(directory) to path (atomically, e.g. for node_exporter)."""
+    temporary = "{0}.{1}.tmp".format(path, os.getpid())
+    with open(temporary, "w") as f:
+        f.write(render_metrics(directory))
+    os.replace(temporary, path)
+
+
+def serve_metrics(directory, port, address="127.0.0.1"):
+    """
+    Serves render_metrics(directory) via HTTP on address:port from
+    a daemon thread. Returns the server; its shutdown() ends serving.
+    """
+    import http.server
+    import threading
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render_metrics(directory).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.HTTPServer((address, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="typecheck metrics")
+    thread.daemon = True
+    thread.start()
+    return server
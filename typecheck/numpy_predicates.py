@@ -0,0 +1,91 @@
+import typecheck.framework as fw
+
+# NumPy is optional: it is imported by the first tc.ndarray() only,
+# which also keeps 'import typecheck' fast.
+
+_ABSTRACT_DTYPES = ("generic", "number", "integer", "signedinteger",
+                    "unsignedinteger", "inexact", "floating",
+                    "complexfloating", "flexible", "character")
+
+
+class ndarray(fw.Checker):
+    """
+    Checks numpy arrays by their metadata in O(1), without touching
+    the elements from Python. min, max, and finite request a content
+    check, which is done by numpy at C speed.
+    """
+    pure = True
+
+    def __init__(self, dtype=None, shape=None, ndim=None, contiguous=None,
+                 min=None, max=None, finite=False):
+        global numpy
+        try:
+            import numpy  # binds the module global, see top of module
+        except ImportError:
+            raise fw.TypeCheckSpecificationError("tc.ndarray requires numpy")
+        abstract = [getattr(numpy, name) for name in _ABSTRACT_DTYPES]
+        if dtype is None or dtype in abstract:
+            self._dtype = dtype  # None or a kind such as numpy.floating
+        else:
+            self._dtype = numpy.dtype(dtype)
+        self._is_abstract_dtype = dtype in abstract
+        self._shape = None if shape is None else tuple(shape)
+        assert self._shape is None or all(
+            n is None or int(n) == n for n in self._shape)
+        self._ndim = len(self._shape) if self._shape is not None else ndim
+        assert ndim is None or ndim == self._ndim
+        assert contiguous in (None, True, "C", "F")
+        self._contiguous = "C" if contiguous is True else contiguous
+        self._min = min
+        self._max = max
+        self._finite = finite
+
+    def __setstate__(self, state):
+        global numpy
+        import numpy  # when unpickled in a process without tc.ndarray() so far
+        self.__dict__.update(state)
+
+    def degrade(self, level):
+        if level != 1 or (self._min is None and self._max is None and not self._finite):
+            return self
+        result = self._copy()  # checks the metadata only
+        result._min = result._max = None
+        result._finite = False
+        return result
+
+    def check(self, value, namespace):
+        if not isinstance(value, numpy.ndarray):
+            return False
+        if self._dtype is not None:
+            if self._is_abstract_dtype:
+                if not numpy.issubdtype(value.dtype, self._dtype):
+                    return False
+            elif value.dtype != self._dtype:
+                return False
+        if self._ndim is not None and value.ndim != self._ndim:
+            return False
+        if self._shape is not None:
+            for wanted, actual in zip(self._shape, value.shape):
+                if wanted is not None and wanted != actual:
+                    return False
+        if self._contiguous == "C" and not value.flags.c_contiguous:
+            return False
+        if self._contiguous == "F" and not value.flags.f_contiguous:
+            return False
+        if self._min is None and self._max is None and not self._finite:
+            return True
+        return value.size == 0 or self._check_content(value)
+
+    def _check_content(self, value):
+        try:
+            with numpy.errstate(invalid="ignore"):
+                if self._finite and not numpy.isfinite(value).all():
+                    return False
+                # NaN compares false with everything, so it fails min and max:
+                if self._min is not None and not value.min() >= self._min:
+                    return False
+                if self._max is not None and not value.max() <= self._max:
+                    return False
+        except TypeError:
+            return False  # e.g. a dtype without order or without isfinite
+        return True
@@ -0,0 +1,183 @@
+"""
+A policy file that sets check levels, sampling, statistics, and
+shadow mode for decorated functions by glob patterns, e.g.
+
+    [myapp.*]
+    level = 1
+    sample_rate = 0.01
+
+    [myapp.api.*]
+    level = 3
+    stats = yes
+
+A pattern applies to a function if it matches the function's full name
+(module.qualname) or its module's name; where several sections apply,
+later ones override the settings of earlier ones. The settings are
+level (see typecheck.levels), sample_rate, every_nth, first_n, seed (see
+typecheck.sampling), stats (see typecheck.checkstats), and shadow (see
+typecheck.shadow). The file is an INI file as read by configparser.
+load_policy() reads a file and applies it to all decorated functions,
+present and future; reload_policy() re-reads it, e.g. upon a signal
+(see reload_policy_on_signal()), after undoing what the previous
+policy had set (except for settings changed again since, e.g. by a
+demotion). Setting environment variable TYPECHECK_POLICY to a
+file name loads it upon 'import typecheck' (with a warning instead
+if the file cannot be read).
+Loading and applying the policy is serialized by a lock.
+"""
+import _thread
+import os
+import warnings
+
+import typecheck.framework as fw
+
+_path = None
+_rules = []  # (pattern, settings dict), in the order of the file
+_lock = _thread.RLock()  # for (re)loading and applying the policy
+
+_CONVERSIONS = {
+    "level": int, "sample_rate": float, "every_nth": int, "first_n": int, "seed": str,
+    "stats": "boolean", "shadow": "boolean",
+}
+_SAMPLING_KEYS = ("sample_rate", "every_nth", "first_n")  # each makes a Sampling
+
+
+def _read(path):
+    """Returns the rules of the policy file."""
+    import configparser
+    parser = configparser.ConfigParser(default_section="", interpolation=None)
+    with open(path, encoding="utf-8") as f:
+        parser.read_file(f)
+    sections = [(name, dict(parser[name])) for name in parser.sections()]
+    return [(pattern, _converted(path, pattern, settings)) for pattern, settings in sections]
+
+
+def _converted(path, pattern, settings):
+    import configparser
+    result = dict()
+    for key, value in settings.items():
+        conversion = _CONVERSIONS.get(key)
+        try:
+            if conversion is None:
+                raise ValueError("unknown setting")
+            if conversion == "boolean":
+                result[key] = configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+            else:
+                result[key] = conversion(value)
+            if key == "level" and result[key] not in (1, 2, 3):
+                raise ValueError("no level")
+        except (KeyError, ValueError, TypeError):
+            raise fw.TypeCheckSpecificationError(
+                "policy file {0}, [{1}]: invalid setting {2} = {3!r}".format(
+                    path, pattern, key, value))
+    if any(key in result for key in _SAMPLING_KEYS):
+        try:
+            _sampling(result)
+        except fw.TypeCheckSpecificationError as e:
+            raise fw.TypeCheckSpecificationError(
+                "policy file {0}, [{1}]: {2}".format(path, pattern, e))
+    return result
+
+
+def _sampling(settings):
+    import typecheck.sampling as sm
+    return sm.Sampling(settings.get("sample_rate"), settings.get("every_nth"),
+                       settings.get("first_n", 0), settings.get("seed"))
+
+
+def _settings(checked):
+    """The settings the policy makes for CheckedFunction checked."""
+    import fnmatch
+    result = dict()
+    for pattern, settings in _rules:
+        if (fnmatch.fnmatchcase(checked.fullname, pattern) or
+                fnmatch.fnmatchcase(checked.module, pattern)):
+            if "sample_rate" in settings or "every_nth" in settings:
+                result.pop("sample_rate", None)  # either one, from the last section
+                result.pop("every_nth", None)
+            result.update(settings)
+    return result
+
+
+def _change(checked, undo, name, value):
+    """Sets attribute name of checked to value, noting in undo what was there before."""
+    undo[name] = (getattr(checked, name), value)
+    setattr(checked, name, value)
+
+
+def _undo(checked, undo):
+    """
+    Restores the attributes noted in undo that still have the value the
+    policy set; returns the names of those.
+    """
+    restored = []
+    for name, (before, after) in undo.items():
+        if getattr(checked, name) is after:
+            setattr(checked, name, before)
+            restored.append(name)
+    return restored
+
+
+def apply(checked):
+    """Applies the policy to CheckedFunction checked, undoing that of before."""
+    import typecheck.checkstats as cs
+    import typecheck.levels as lv
+    import typecheck.sampling as sm
+    with _lock:
+        restored = _undo(checked, checked.policy_undo)
+        undo = checked.policy_undo = dict()  # attribute -> (value before, value set)
+        settings = _settings(checked)
+        if "level" in settings:
+            _change(checked, undo, "own_level", settings["level"])
+        if any(key in settings for key in _SAMPLING_KEYS):
+            _change(checked, undo, "own_sampling", _sampling(settings))
+        if "stats" in settings and settings["stats"] != (checked.stats is not None):
+            _change(checked, undo, "stats",
+                    cs.FunctionStats(checked.fullname) if settings["stats"] else None)
+        if "shadow" in settings:
+            _change(checked, undo, "shadow", settings["shadow"])
+        if "own_sampling" in restored or "own_sampling" in undo:
+            checked.set_sampling(checked.own_sampling or sm._policy)
+        level = lv.effective_level(checked)
+        if level != checked.level:
+            checked.set_level(level)
+
+
+def load_policy(path):
+    """Reads the policy file and applies it; see above."""
+    global _path, _rules
+    import typecheck.decorators as tcd
+    with _lock:
+        rules = _read(path)  # errors leave the previous policy in effect
+        _path, _rules = path, rules
+        for checked in tcd.checked_functions():
+            apply(checked)
+
+
+def reload_policy():
+    """Re-reads the policy file last loaded and applies it anew."""
+    with _lock:  # (e.g. for two signals in quick succession)
+        if _path is not None:
+            load_policy(_path)
+
+
+def reload_policy_on_signal(signum=None):
+    """
+    Makes the (POSIX) signal signum (default: SIGHUP) reload the policy.
+    Must be called from the main thread.
+    """
+    import signal
+    import threading
+
+    def handler(signum, frame):
+        # not in the interrupted thread, which may hold locks the reload needs:
+        threading.Thread(target=reload_policy, name="typecheck policy reload").start()
+    signal.signal(signal.SIGHUP if signum is None else signum, handler)
+
+
+if os.environ.get("TYPECHECK_POLICY"):  # no function is decorated yet
+    try:
+        _rules = _read(os.environ["TYPECHECK_POLICY"])
+        _path = os.environ["TYPECHECK_POLICY"]
+    except Exception as e:  # (a broken policy file must not break 'import typecheck')
+        warnings.warn("ignoring policy file {0}: {1}".format(os.environ["TYPECHECK_POLICY"], e))
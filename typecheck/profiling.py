@@ -0,0 +1,153 @@
+"""
+Profiling of the checker trees of a decorated function or a Validator.
+
+    with tc.profile_checks(my_function) as profile:
+        run_workload()
+    print(profile.report())
+
+While the with statement runs, every checker in the tree counts its calls
+and measures its total time and its self time (total time minus that
+of the checkers it delegates to), so one can see which node inside
+a nested annotation is expensive.
+as_dict() returns the same tree as plain data, e.g. for comparing
+releases. The timing itself adds a little to the self times of the
+checkers that have children.
+"""
+import _thread
+import time
+
+import typecheck.framework as fw
+
+
+class _Node:
+    def __init__(self, label, checker, stats, children):
+        self.label = label
+        self.checker = checker
+        self.stats = stats  # shared by all nodes of the same checker
+        self.children = children
+
+
+class _CheckerStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.self_time = 0.0
+
+
+class CheckerProfile:
+    """The per-checker timings of one function, Validator, or checker."""
+    def __init__(self, target):
+        import typecheck.validator as tcv
+        self._checked = getattr(target, "__typecheck__", None)
+        if self._checked is not None:
+            checked = self._checked
+            roots = [(d[0], d[1]) for d in checked.arg_checkers if d is not None]
+            roots.extend(sorted(checked.kwarg_checkers.items()))
+            if checked.return_checker is not None:
+                roots.append(("return", checked.return_checker))
+        elif isinstance(target, tcv.Validator):
+            roots = [("", target.checker)]
+        elif isinstance(target, fw.Checker):
+            roots = [("", target)]
+        else:
+            raise TypeError("can only profile @typecheck-decorated functions, "
+                            "Validators, and checkers, not {0!r}".format(target))
+        self._stats = dict()  # id(checker) -> (checker, _CheckerStats)
+        self._stack = _thread._local()  # per thread: children's times of running checks
+        self.roots = []
+        for label, checker in roots:
+            checker.prepare()  # builds lazily built children
+            self.roots.append(self._node(label, checker, ()))
+
+    def _node(self, label, checker, ancestors):
+        if id(checker) not in self._stats:
+            self._stats[id(checker)] = (checker, _CheckerStats())
+        children = []
+        if checker not in ancestors:  # recursive checker structures stop here
+            children = [self._node("", child, ancestors + (checker,))
+                        for child in checker.children()]
+        return _Node(label, checker, self._stats[id(checker)][1], children)
+
+    def __enter__(self):
+        for checker, stats in self._stats.values():
+            assert "check" not in checker.__dict__, "already being profiled"
+            checker.check = self._timed(checker.check, stats)
+        if self._checked is not None:
+            # precompiled check functions (see typecheck.compile) may have
+            # inlined class checks, which could then not be timed:
+            import typecheck.decorators as tcd
+            self._saved = (self._checked.check_args, self._checked.check_result)
+            self._checked.check_args, self._checked.check_result = \
+                tcd.make_check_functions(self._checked)
+        return self
+
+    def __exit__(self, *exc_info):
+        for checker, stats in self._stats.values():
+            del checker.check  # the class's method is visible again
+        if self._checked is not None:
+            self._checked.check_args, self._checked.check_result = self._saved
+        return False
+
+    def _timed(self, check, stats):
+        clock = time.perf_counter
+        local = self._stack
+
+        def timed_check(value, namespace):
+            stack = local.__dict__.setdefault("stack", [])
+            stack.append(0.0)  # will hold the time spent in children
+            start = clock()
+            try:
+                return check(value, namespace)
+            finally:
+                elapsed = clock() - start
+                stats.calls += 1
+                stats.total += elapsed
+                stats.self_time += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+        return timed_check
+
+    def as_dict(self):
+        """Returns the list of root nodes, each a dict, as does 'children'."""
+        def node_dict(node):
+            return dict(label=node.label, checker=_describe(node.checker),
+                        calls=node.stats.calls, total=node.stats.total,
+                        self=node.stats.self_time,
+                        children=[node_dict(child) for child in node.children])
+        return [node_dict(root) for root in self.roots]
+
+    def report(self):
+        """Returns the annotated checker trees as text; times in microseconds."""
+        lines = ["{0:>9} {1:>10} {2:>10}  {3}".format("calls", "total_us",
+                                                      "self_us", "checker")]
+
+        def add(node, depth):
+            label = node.label + ": " if node.label else ""
+            lines.append("{0:9d} {1:10.1f} {2:10.1f}  {3}{4}{5}".format(
+                node.stats.calls, 1e6 * node.stats.total,
+                1e6 * node.stats.self_time, "  " * depth, label,
+                _describe(node.checker)))
+            for child in node.children:
+                add(child, depth + 1)
+        for root in self.roots:
+            add(root, 0)
+        return "\n".join(lines) + "\n"
+
+
+def _describe(checker):
+    """E.g. 'TypeChecker(int)' or 'GenericMetaChecker(typing.List[int])'."""
+    name = type(checker).__name__
+    cls = checker.__dict__.get("_cls")
+    if cls is None:
+        return name
+    if type(cls) is type:
+        return "{0}({1})".format(name, cls.__qualname__)
+    return "{0}({1!r})".format(name, cls)
+
+
+def profile_checks(target):
+    """
+    Returns a CheckerProfile for a decorated function, Validator,
+    or checker, to be used in a with statement.
+    """
+    return CheckerProfile(target)
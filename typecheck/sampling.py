@@ -0,0 +1,116 @@
+"""
+Checking only some of the calls of a decorated function.
+
+A Sampling says which calls get checked: the first first_n calls,
+then every every_nth call or a random share of sample_rate of them.
+Decorate with @tc.typecheck_sampled(...) for a function of its own
+or call tc.set_sampling(...) for all other decorated functions.
+A call that is not checked costs little more than the call of the proxy:
+the proxy counts down the calls to skip, which the function's _Sampler computes
+at each checked call (for sample_rate, a geometrically distributed gap,
+so that only checked calls draw a random number).
+The countdown is not atomic, so under threads the rate is approximate.
+With a seed, each function's sequence of checked calls is reproducible.
+"""
+import math
+import sys
+
+import typecheck.framework as fw
+
+_policy = None  # Sampling for decorated functions without one of their own
+
+
+class Sampling:
+    def __init__(self, sample_rate=None, every_nth=None, first_n=0, seed=None):
+        if sample_rate is not None and every_nth is not None:
+            raise fw.TypeCheckSpecificationError(
+                "sampling needs sample_rate or every_nth, not both")
+        if sample_rate is None and every_nth is None and not first_n:
+            raise fw.TypeCheckSpecificationError(
+                "sampling needs sample_rate, every_nth, or first_n")
+        if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+            raise fw.TypeCheckSpecificationError(
+                "sample_rate must be between 0 and 1, not {0}".format(sample_rate))
+        if every_nth is not None and (int(every_nth) != every_nth or every_nth < 1):
+            raise fw.TypeCheckSpecificationError(
+                "every_nth must be a positive integer, not {0}".format(every_nth))
+        self.sample_rate = sample_rate
+        self.every_nth = every_nth
+        self.first_n = first_n
+        self.seed = seed
+
+    def __repr__(self):
+        return "Sampling(sample_rate={0!r}, every_nth={1!r}, first_n={2!r}, seed={3!r})".format(
+            self.sample_rate, self.every_nth, self.first_n, self.seed)
+
+    def sampler(self, name):
+        return _Sampler(self, name)
+
+
+class _Sampler:
+    """The sampling state of one decorated function."""
+    def __init__(self, sampling, name):
+        import random
+        self.sampling = sampling
+        self.first_n = sampling.first_n  # checked calls still to come before sampling
+        if sampling.seed is None:
+            self._random = random.Random()
+        else:  # str seeds are hashed deterministically, unlike hash(name):
+            self._random = random.Random("{0}:{1}".format(sampling.seed, name))
+
+    def rate(self):
+        """The share of the calls from now on that will be checked."""
+        if self.first_n > 0:
+            return 1.0
+        if self.sampling.every_nth is not None:
+            return 1.0 / self.sampling.every_nth
+        return self.sampling.sample_rate or 0.0
+
+    def first_gap(self):
+        """Returns how many calls to skip before the first checked one."""
+        return 0 if self.first_n > 0 else self._sampled_gap()
+
+    def gap(self):
+        """Returns how many calls to skip after the current (checked) one."""
+        if self.first_n > 0:
+            self.first_n -= 1
+            if self.first_n > 0:
+                return 0
+        return self._sampled_gap()
+
+    def _sampled_gap(self):
+        if self.sampling.every_nth is not None:
+            return self.sampling.every_nth - 1
+        rate = self.sampling.sample_rate
+        if rate is None or rate == 0.0:
+            return sys.maxsize  # check no further calls
+        if rate == 1.0:
+            return 0
+        # the number of calls before the next one that is checked,
+        # if each is checked with probability rate:
+        return int(math.log(1.0 - self._random.random()) / math.log(1.0 - rate))
+
+
+def set_sampling(sample_rate=None, every_nth=None, first_n=0, seed=None):
+    """
+    Makes all decorated functions, present and future, that have no
+    sampling of their own check only some of their calls (see Sampling).
+    Without arguments, they check all calls again.
+    """
+    global _policy
+    if sample_rate is None and every_nth is None and not first_n:
+        _policy = None
+    else:
+        _policy = Sampling(sample_rate, every_nth, first_n, seed)
+    import typecheck.decorators as tcd
+    for checked in tcd.checked_functions():
+        if checked.own_sampling is None:
+            checked.set_sampling(_policy)
+
+
+def effective_rates():
+    """Returns a dict from the full name of each decorated function to
+    the share of its calls that is checked (as far as known in advance)."""
+    import typecheck.decorators as tcd
+    return {checked.fullname: 1.0 if checked.sampler is None else checked.sampler.rate()
+            for checked in tcd.checked_functions()}
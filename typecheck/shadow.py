@@ -0,0 +1,154 @@
+"""
+Shadow mode: recording check violations instead of raising exceptions.
+
+A decorated function in shadow mode calls its body (and returns its
+result) even if its checks fail; the violation is recorded in a bounded
+buffer instead. Violations of the same parameter (or result) of the
+same function by values of the same type are counted in one entry,
+which keeps the (reprlib-truncated) repr of the first such value.
+When the buffer is full, the entry that has not been updated for the
+longest time is dropped.
+Optionally, violations are also logged, each entry at most once per
+log_interval seconds.
+Shadow mode only changes what happens after a check has failed,
+so calls that pass their checks cost the same in both modes.
+Recorded violations count as check failures in the statistics.
+"""
+import _thread
+import collections
+import reprlib
+import time
+
+_enabled = False  # whether functions decorated from now on are in shadow mode
+
+
+class Violation:
+    """The violations of one parameter by values of one type."""
+    def __init__(self, function, parameter, value_repr, value_type, now):
+        self.function = function  # full name
+        self.parameter = parameter  # or "return"
+        self.value_repr = value_repr
+        self.value_type = value_type  # full name
+        self.count = 1
+        self.first_time = self.last_time = now
+        self.logged_count = 0
+        self.logged_time = None
+
+    def __repr__(self):
+        return "<Violation {0}({1}): {2} of type {3}, {4} times>".format(
+            self.function, self.parameter, self.value_repr, self.value_type, self.count)
+
+
+class ViolationBuffer:
+    def __init__(self, capacity=1000, repr_limit=80, logger=None, log_interval=60.0):
+        self._lock = _thread.allocate_lock()
+        self._entries = collections.OrderedDict()  # key -> Violation, oldest first
+        self.dropped = 0  # entries dropped because the buffer was full
+        self.configure(capacity, repr_limit, logger, log_interval)
+
+    def configure(self, capacity, repr_limit, logger, log_interval):
+        self.capacity = capacity
+        self.logger = logger
+        self.log_interval = log_interval
+        self._repr_limit = repr_limit
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = self._repr.maxother = repr_limit
+
+    def _truncated_repr(self, value):
+        text = self._repr.repr(value)
+        if len(text) > self._repr_limit:
+            text = text[:self._repr_limit - 3] + "..."
+        return text
+
+    def record(self, function, parameter, value):
+        valuetype = type(value)
+        key = (function, parameter, valuetype)
+        described = None  # (repr, type name) of value, for a new entry
+        while True:
+            now = time.time()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.count += 1
+                    entry.last_time = now
+                    self._entries.move_to_end(key)  # frequent ones are kept longest
+                elif described is not None:
+                    entry = Violation(function, parameter, described[0], described[1], now)
+                    self._entries[key] = entry
+                    while len(self._entries) > self.capacity:
+                        self._entries.popitem(last=False)
+                        self.dropped += 1
+                if entry is not None:
+                    newcount = self._unlogged(entry, now)
+                    break
+            # not under the lock, as __repr__ may call shadowed functions, too:
+            described = (self._truncated_repr(value),
+                         "{0}.{1}".format(valuetype.__module__, valuetype.__qualname__))
+        if newcount is not None:
+            self.logger.warning("%s() has got an incompatible value for %s: %s "
+                                "(type %s, %d times)", entry.function, entry.parameter,
+                                entry.value_repr, entry.value_type, newcount)
+
+    def _unlogged(self, entry, now):
+        """The count of entry to log now (and then counted as logged), or None."""
+        if self.logger is None or (entry.logged_time is not None and
+                                   now < entry.logged_time + self.log_interval):
+            return None
+        newcount = entry.count - entry.logged_count
+        entry.logged_count, entry.logged_time = entry.count, now
+        return newcount
+
+    def drain(self):
+        """Returns the Violations recorded, oldest first, and empties the buffer."""
+        with self._lock:
+            result = list(self._entries.values())
+            self._entries.clear()
+            self.dropped = 0
+        return result
+
+
+_buffer = ViolationBuffer()
+_local = _thread._local()  # .count: violations recorded by this thread
+
+
+def record(function, parameter, value):
+    """Records a violation of a check of the current thread's call."""
+    _local.count = recorded_in_thread() + 1
+    _buffer.record(function, parameter, value)
+
+
+def recorded_in_thread():
+    """The number of violations the current thread has recorded so far."""
+    return _local.__dict__.get("count", 0)
+
+################################################################################
+
+def enable_shadow_mode(functions=None, capacity=1000, repr_limit=80,
+                       logger=None, log_interval=60.0):
+    """
+    Makes the given decorated functions (by default: all, present and
+    future) record violations in the buffer rather than raise;
+    the other arguments configure the buffer, see above.
+    """
+    global _enabled
+    import typecheck.decorators as tcd
+    _buffer.configure(capacity, repr_limit, logger, log_interval)
+    if functions is None:
+        _enabled = True
+    for checked in tcd.selected_functions(functions):
+        checked.shadow = True
+
+
+def disable_shadow_mode(functions=None):
+    """Makes the functions raise upon violations again, like enable_shadow_mode()."""
+    global _enabled
+    import typecheck.decorators as tcd
+    if functions is None:
+        _enabled = False
+    for checked in tcd.selected_functions(functions):
+        checked.shadow = False
+
+
+def drain_violations():
+    """Returns the recorded Violations and empties the buffer."""
+    return _buffer.drain()
@@ -0,0 +1,29 @@
+"""
+The signature information @typecheck needs, without inspect where possible.
+
+For plain functions, the parameter names come straight from the code
+object, which is what inspect.getfullargspec() reads, too, but without
+importing inspect (which is costly for processes that start often,
+such as the workers of a pre-fork server) and without building a full
+Signature. Annotations, defaults, and checkers are live objects and are
+taken from the function as usual.
+"""
+import collections
+import types
+
+ArgSpec = collections.namedtuple("ArgSpec",
+                                 "args kwonlyargs defaults kwonlydefaults annotations")
+
+
+def getfullargspec(method):
+    """Like inspect.getfullargspec(method), for the fields @typecheck uses."""
+    if type(method) is not types.FunctionType:
+        import inspect  # deferred to keep 'import typecheck' fast
+        return inspect.getfullargspec(method)
+    code = method.__code__
+    nargs = code.co_argcount  # (includes positional-only parameters)
+    return ArgSpec(args=list(code.co_varnames[:nargs]),
+                   kwonlyargs=list(code.co_varnames[nargs:nargs + code.co_kwonlyargcount]),
+                   defaults=method.__defaults__,
+                   kwonlydefaults=method.__kwdefaults__,
+                   annotations=dict(method.__annotations__))
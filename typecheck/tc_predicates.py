@@ -1,16 +1,36 @@
+import _thread
 import builtins
 import collections
-import random
-import re as regex_module
 
 import typecheck.framework as fw
 
+# Module random is imported by the first sampling of a seq_of(), module re
+# by the first tc.re(), to keep 'import typecheck' fast.
+
+_thread_local = _thread._local()
+
+
+def _random():
+    """
+    The random.Random object of the current thread: sampling never
+    touches the shared state of module random (which would make concurrent
+    checks contend for it and disturb the random sequence of the program).
+    """
+    try:
+        return _thread_local.random
+    except AttributeError:
+        import random
+        _thread_local.random = random.Random()
+        return _thread_local.random
+
 
 def ismapping(annotation):
     return isinstance(annotation, collections.Mapping)
 
 
 class FixedMappingChecker(fw.Checker):
+    pure = True
+
     def __init__(self, the_mapping):
         self._checks = {key: fw.Checker.create(val)
                         for key, val in the_mapping.items()}
@@ -23,12 +43,16 @@ class FixedMappingChecker(fw.Checker):
                 return False
         return True
 
+    def check_class(self, themap):
+        return ismapping(themap) and len(themap) == len(self._checks)
+
 
 fw.Checker.register(ismapping, FixedMappingChecker)
 
 
 class CallableChecker(fw.Checker):
     """Used if the annotation is a function (which must be predicate)."""
+    pure = False  # the predicate may consult anything
     def __init__(self, callable):
         self._callable = callable
 
@@ -43,6 +67,8 @@ fw.Checker.register(builtins.callable, CallableChecker)
 
 
 class hasattrs(fw.Checker):
+    pure = True
+
     def __init__(self, *attrs):
         self._attrs = attrs
         assert all([type(a) == str for a in attrs])
@@ -51,45 +77,196 @@ class hasattrs(fw.Checker):
         return builtins.all([hasattr(value, attr) for attr in self._attrs])
 
 
+CacheInfo = collections.namedtuple("CacheInfo", "hits misses maxsize currsize")
+
+
 class re(fw.Checker):
+    """
+    Bytes regexes also apply to the other objects module re can scan
+    without copying them (bytearray, memoryview, mmap).
+    max_scan limits the search to the first max_scan characters (or bytes);
+    a regex ending in '$' then rejects all longer values.
+    cache_size > 0 makes the checker remember the results for that many
+    str (or bytes) values of at most cache_max_len characters;
+    cache_policy "lru" evicts the least recently used entry, "fifo" the oldest.
+    """
+    pure = True
+
     _regex_eols = {str: "$", bytes: b"$"}
     _value_eols = {str: "\n", bytes: b"\n"}
 
-    def __init__(self, regex):
+    def __init__(self, regex, max_scan=None,
+                 cache_size=0, cache_policy="lru", cache_max_len=256):
+        import mmap
+        import re as regex_module
         self._regex_t = type(regex)
         assert type(regex) in [str, bytes]
         self._regex = regex_module.compile(regex)
         self._regex_eol = regex[-1:] == self._regex_eols.get(self._regex_t)
         self._value_eol = self._value_eols[self._regex_t]
+        self._buffer_types = ((bytearray, memoryview, mmap.mmap)
+                              if self._regex_t is bytes else ())
+        self._max_scan = max_scan
+        assert max_scan is None or max_scan >= 0
+        assert cache_policy in ("lru", "fifo")
+        self._cache_size = int(cache_size)
+        self._cache_lru = cache_policy == "lru"
+        self._cache_max_len = cache_max_len
+        self._init_cache()
+
+    def _init_cache(self):
+        self._cache = collections.OrderedDict() if self._cache_size > 0 else None
+        self._cache_lock = _thread.allocate_lock()
+        self._hits = self._misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_cache", "_cache_lock", "_hits", "_misses"):
+            del state[name]  # a lock does not pickle; the cache need not
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_cache()
+
+    def cache_info(self):
+        """
+        Returns the CacheInfo(hits, misses, maxsize, currsize) of the match
+        cache. Frozen checkers (see freeze()) only look values up in it:
+        they neither add entries nor count.
+        """
+        return CacheInfo(self._hits, self._misses, self._cache_size,
+                         len(self._cache) if self._cache is not None else 0)
+
+    def cache_clear(self):
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.clear()
+            self._hits = self._misses = 0
+
+    def check(self, value, namespace):
+        cache = self._cache
+        if (cache is None or type(value) is not self._regex_t or
+                len(value) > self._cache_max_len):
+            return self._matches(value)
+        result = cache.get(value)
+        if self._frozen:  # do not touch the (shared) memory pages of the cache
+            return self._matches(value) if result is None else result
+        if result is not None:
+            # Hits need no lock: a lost count is harmless and so is
+            # an entry evicted meanwhile (by another thread).
+            self._hits += 1
+            if self._cache_lru:
+                try:
+                    cache.move_to_end(value)
+                except KeyError:
+                    pass
+            return result
+        result = self._matches(value)
+        with self._cache_lock:
+            self._misses += 1
+            cache[value] = result
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        return result
+
+    def _matches(self, value):
+        if type(value) is not self._regex_t:
+            if not isinstance(value, self._buffer_types):
+                return False
+            try:
+                return self._search(value)
+            except (TypeError, ValueError, BufferError, NotImplementedError):
+                return False  # e.g. a non-contiguous or released memoryview
+        return self._search(value)
+
+    def _search(self, value):
+        # value[-1:] rather than endswith(), which memoryview and mmap lack:
+        if self._regex_eol and value[-1:] == self._value_eol:
+            return False
+        if self._max_scan is None:
+            return self._regex.search(value) is not None
+        if self._regex_eol and len(value) > self._max_scan:
+            return False  # '$' would match at the end of the window
+        return self._regex.search(value, 0, self._max_scan) is not None
+
+
+def _checkonly(checkonly, minimum):
+    """Validates a checkonly argument; None means: check all elements."""
+    if checkonly is None:
+        return None
+    checkonly = int(checkonly)
+    assert checkonly >= minimum
+    return checkonly
+
+
+class buffer(fw.Checker):
+    """
+    Allows any object supporting the buffer protocol (bytes, bytearray,
+    memoryview, array.array, mmap, ...) whose buffer has the given properties.
+    Only the metadata of memoryview(value) is inspected, so the data are
+    neither copied nor read.
+    """
+    pure = True
+
+    def __init__(self, format=None, itemsize=None, ndim=None,
+                 min_len=None, max_len=None, readonly=None):
+        self._format = format
+        self._itemsize = itemsize
+        self._ndim = ndim
+        self._min_len = min_len
+        self._max_len = max_len
+        self._readonly = readonly
+        assert format is None or type(format) == str
 
     def check(self, value, namespace):
-        return type(value) is self._regex_t and \
-               (not self._regex_eol or not value.endswith(self._value_eol)) and \
-               self._regex.search(value) is not None
+        try:
+            view = memoryview(value)
+        except TypeError:
+            return False  # does not support the buffer protocol
+        with view:  # releases the buffer (e.g. so that a bytearray can grow again)
+            length = view.nbytes // view.itemsize if view.itemsize else 0
+            return ((self._format is None or view.format == self._format) and
+                    (self._itemsize is None or view.itemsize == self._itemsize) and
+                    (self._ndim is None or view.ndim == self._ndim) and
+                    (self._min_len is None or length >= self._min_len) and
+                    (self._max_len is None or length <= self._max_len) and
+                    (self._readonly is None or view.readonly == self._readonly))
 
 
 class sequence_of(fw.Checker):
+    pure = True
+
     def __init__(self, check, checkonly=4):
         self._check = fw.Checker.create(check)
-        self._checkonly = int(checkonly)
-        assert self._checkonly >= 2
+        self._checkonly = _checkonly(checkonly, 2)
 
     def check(self, value, namespace):
         if len(value) == 0:
             return True
         elif len(value) == 1:
             return self._check.check(value[0], namespace)
-        if len(value) <= self._checkonly:
+        if self._checkonly is None or len(value) <= self._checkonly:
             checkhere = builtins.range(len(value))
         else:
-            checkhere = random.sample(builtins.range(1, len(value) - 1),
-                                      self._checkonly - 2)  # w/o replacement
+            checkhere = _random().sample(builtins.range(1, len(value) - 1),
+                                         self._checkonly - 2)  # w/o replacement
             checkhere += [0, len(value) - 1]  # always check first and last
         for idx in checkhere:
             if not self._check.check(value[idx], namespace):
                 return False
         return True
 
+    def check_class(self, value):
+        return True  # the class is tested by seq_of and list_of only
+
+    def degrade(self, level):
+        if level != 3:
+            return super().degrade(level)
+        result = self._with_degraded_children(level)
+        result._checkonly = None  # check all elements
+        return result
+
 
 class seq_of(sequence_of):
     def check(self, value, namespace):
@@ -97,19 +274,26 @@ class seq_of(sequence_of):
                 not isinstance(value, str) and
                 super().check(value, namespace))
 
+    def check_class(self, value):
+        return isinstance(value, collections.Sequence) and not isinstance(value, str)
+
 
 class list_of(sequence_of):
     def check(self, value, namespace):
         return (isinstance(value, collections.MutableSequence) and
                 super().check(value, namespace))
 
+    def check_class(self, value):
+        return isinstance(value, collections.MutableSequence)
+
 
 class map_of(fw.Checker):
+    pure = True
+
     def __init__(self, key_check, value_check, checkonly=4):
         self._key_check = fw.Checker.create(key_check)
         self._value_check = fw.Checker.create(value_check)
-        self._checkonly = int(checkonly)
-        assert self._checkonly >= 1
+        self._checkonly = _checkonly(checkonly, 1)
 
     def check(self, value, namespace):
         if not isinstance(value, collections.Mapping):
@@ -124,8 +308,20 @@ class map_of(fw.Checker):
                 break
         return True
 
+    def check_class(self, value):
+        return isinstance(value, collections.Mapping)
+
+    def degrade(self, level):
+        if level != 3:
+            return super().degrade(level)
+        result = self._with_degraded_children(level)
+        result._checkonly = None  # check all items
+        return result
+
 
 class range(fw.Checker):
+    pure = True
+
     def __init__(self, low, high):
         assert type(low) == type(high)
         self._low = low
@@ -142,6 +338,8 @@ class range(fw.Checker):
 
 
 class enum(fw.Checker):
+    pure = True
+
     def __init__(self, *values):
         self._values = values
 
@@ -150,6 +348,8 @@ class enum(fw.Checker):
 
 
 class any(fw.Checker):
+    pure = True
+
     def __init__(self, *args):
         self._checks = tuple(fw.Checker.create(arg) for arg in args)
 
@@ -162,6 +362,8 @@ class any(fw.Checker):
 
 
 class all(fw.Checker):
+    pure = True
+
     def __init__(self, *args):
         self._checks = tuple(fw.Checker.create(arg) for arg in args)
 
@@ -174,6 +376,8 @@ class all(fw.Checker):
 
 
 class none(fw.Checker):
+    pure = True
+
     def __init__(self, *args):
         self._checks = tuple(fw.Checker.create(arg) for arg in args)
 
@@ -184,6 +388,9 @@ class none(fw.Checker):
         else:
             return True
 
+    def degrade(self, level):
+        return self  # degraded children would make it reject more values
+
 
 def anything(x):
     return True
@@ -0,0 +1,47 @@
+import typecheck as tc
+import typecheck.boundary as bd
+from .testhelper import expected
+
+############################################################################
+
+def in_module(module, source, **names):
+    """Executes source as if it were code in the module of the given name."""
+    namespace = dict(names, __name__=module, tc=tc)
+    exec(source, namespace)
+    return namespace
+
+
+inner = in_module("app.core", "@tc.typecheck\ndef inner(a: int) -> int: return a")["inner"]
+
+
+def call_from(module, function, *args):
+    return in_module(module, "result = function(*args)", function=function, args=args)["result"]
+
+
+def test_boundary_checking():
+    tc.enable_boundary_checking(["app"])
+    try:
+        assert call_from("app", inner, "x") == "x"  # trusted callers
+        assert call_from("app.api.v1", inner, "x") == "x"
+        with expected(tc.InputParameterError("inner() has got an incompatible value for a: x")):
+            call_from("apple", inner, "x")  # not a submodule
+        with expected(tc.InputParameterError("inner() has got an incompatible value for a: x")):
+            inner("x")
+        with tc.checking("full"), expected(tc.InputParameterError("for a: x")):
+            call_from("app", inner, "x")
+        later = in_module("app.util", "@tc.typecheck\ndef later(a: int): pass")["later"]
+        call_from("app", later, "x")  # decorated after enabling, too
+    finally:
+        tc.disable_boundary_checking()
+    assert not bd._decisions
+    with expected(tc.InputParameterError("for a: x")):
+        call_from("app", inner, "x")
+
+
+def test_untrusted_function():
+    tc.enable_boundary_checking(["elsewhere"])  # inner is not in there
+    try:
+        with expected(tc.InputParameterError("for a: x")):
+            call_from("elsewhere", inner, "x")
+    finally:
+        tc.disable_boundary_checking()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import threading
+
+import typecheck as tc
+from .testhelper import expected
+
+############################################################################
+
+@tc.typecheck
+def leveled(a: int):
+    pass
+
+
+@tc.typecheck_sampled(every_nth=1000)
+def leveled_sampled(a: int):
+    pass
+
+
+def test_checking_levels():
+    with expected(tc.InputParameterError("leveled() has got an incompatible value for a: x")):
+        leveled("x")
+    with tc.checking("off"):
+        leveled("x")
+        with tc.checking("full"):
+            with expected(tc.InputParameterError("leveled_sampled() has got an incompatible value for a: x")):
+                leveled_sampled("x")
+        leveled_sampled("x")
+    with tc.checking("sampled"):
+        leveled_sampled("x")  # is not the 1000th call
+        with expected(tc.InputParameterError("leveled() has got an incompatible value for a: x")):
+            leveled("x")
+    with expected(tc.InputParameterError("leveled() has got an incompatible value for a: x")):
+        leveled("x")
+
+
+def test_checking_level_is_read_once_checking_is_used():
+    script = ("import typecheck as tc, typecheck.checklevel as ck\n"
+              "@tc.typecheck\ndef g(a: int): pass\n"
+              "try: g('x')\nexcept tc.InputParameterError: print(ck.used)\n"
+              "with tc.checking('off'): g('x')\n"
+              "print(ck.used)\n")
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     cwd=here, universal_newlines=True)
+    assert output.split() == ["False", "True"]
+
+
+def test_checking_level_is_per_thread():
+    failures = []
+
+    def other_thread():
+        try:
+            leveled("x")
+        except tc.InputParameterError:
+            failures.append(True)
+    with tc.checking("off"):
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        leveled("x")
+    assert failures == [True]
+
+
+def test_checking_level_must_be_known():
+    with expected(tc.TypeCheckSpecificationError("level must be one of off, sampled, full, not 'none'")):
+        with tc.checking("none"):
+            pass
+
+
+def test_checking_does_not_shadow_a_module():
+    import typecheck.checklevel as ck
+    assert ck.current_level() == ck.SAMPLED
+    assert tc.checking is ck.checking
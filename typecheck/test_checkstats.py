@@ -0,0 +1,74 @@
+import time
+
+import typecheck as tc
+from .testhelper import expected
+
+############################################################################
+
+@tc.typecheck
+def stats_foo(a: int) -> int:
+    return a
+
+
+@tc.typecheck
+def stats_slow(a: tc.seq_of(int)) -> tc.optional(str):
+    time.sleep(0.002)
+    return None if a else 0
+
+
+NAME = __name__ + ".stats_foo"
+
+
+def test_stats_disabled_by_default():
+    assert stats_foo.__typecheck__.stats is None
+    stats_foo(1)
+    assert NAME not in tc.stats()
+
+
+def test_stats():
+    tc.enable_stats()
+    try:
+        for i in range(10):
+            stats_foo(i)
+        with expected(tc.InputParameterError("stats_foo() has got an incompatible value for a: x")):
+            stats_foo("x")
+        stats_slow([1, 2])
+        with expected(tc.ReturnValueError("stats_slow() has returned an incompatible value: 0")):
+            stats_slow([])
+        data = tc.stats()
+        foo = data[NAME]
+        assert foo["calls"] == 11 and foo["failures"] == 1
+        assert foo["args"]["total"] > 0 and foo["body"]["total"] > 0
+        assert foo["args"]["p50"] <= foo["args"]["p90"] <= foo["args"]["p99"]
+        slow = data[__name__ + ".stats_slow"]
+        assert slow["calls"] == 2 and slow["failures"] == 1
+        assert slow["body"]["total"] >= 0.004
+        assert slow["body"]["p50"] >= 0.002
+        report = tc.stats_report(sort="body").splitlines()
+        assert "calls" in report[0] and "function" in report[0]
+        assert report[1].endswith("stats_slow")
+        assert len(tc.stats_report(sort="calls", limit=1).splitlines()) == 2
+        with expected(ValueError("sort must be one of")):
+            tc.stats_report(sort="nonsense")
+        tc.reset_stats()
+        assert tc.stats()[NAME]["calls"] == 0
+        tc.disable_stats([stats_slow])
+        assert __name__ + ".stats_slow" not in tc.stats()
+    finally:
+        tc.disable_stats()
+    assert tc.stats() == {}
+
+
+def test_stats_for_selected_functions():
+    tc.enable_stats([stats_foo])
+    try:
+        stats_foo(1)
+        stats_slow([1])
+        assert list(tc.stats()) == [NAME]
+
+        @tc.typecheck
+        def stats_later(a: int):
+            pass
+        assert stats_later.__typecheck__.stats is None  # only after enable_stats()
+    finally:
+        tc.disable_stats()
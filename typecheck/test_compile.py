@@ -0,0 +1,117 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+
+import typecheck as tc
+import typecheck.compile as tcc
+from .testhelper import expected
+
+############################################################################
+
+PACKAGE_SOURCE = '''
+import typecheck as tc
+
+@tc.typecheck
+def foo(a: int, b, c: tc.optional(str)=None, *args, k: float, **kwargs) -> int:
+    return a
+
+class Bar:
+    @tc.typecheck
+    def bar(self, x: ANNOTATION):
+        return x
+'''
+
+
+def _write_package(dirname, annotation="int"):
+    pkgdir = os.path.join(dirname, "tc_compiled_pkg")
+    os.makedirs(pkgdir, exist_ok=True)
+    with open(os.path.join(pkgdir, "__init__.py"), "w") as f:
+        f.write("")
+    with open(os.path.join(pkgdir, "mod.py"), "w") as f:
+        f.write(PACKAGE_SOURCE.replace("ANNOTATION", annotation))
+    return os.path.join(pkgdir, "mod.py")
+
+
+def _import_fresh(dirname):
+    for name in ("tc_compiled_pkg", "tc_compiled_pkg.mod"):
+        sys.modules.pop(name, None)
+    tcc._loaded.clear()
+    importlib.invalidate_caches()
+    sys.path.insert(0, dirname)
+    try:
+        return importlib.import_module("tc_compiled_pkg.mod")
+    finally:
+        sys.path.remove(dirname)
+
+
+def _is_compiled(function):
+    code = function.__typecheck__.check_args.__code__
+    return code.co_filename.endswith(tcc.SUFFIX)
+
+
+def test_compile_and_use_wrappers():
+    with tempfile.TemporaryDirectory() as dirname:
+        modfile = _write_package(dirname)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([dirname] + sys.path))
+        subprocess.check_call([sys.executable, "-m", "typecheck.compile",
+                               "tc_compiled_pkg"], env=env)
+        assert os.path.exists(tcc.wrapperpath(modfile))
+        mod = _import_fresh(dirname)
+        assert _is_compiled(mod.foo) and _is_compiled(mod.Bar.bar)
+        assert mod.foo(1, "b", k=1.0) == 1
+        assert mod.foo(1, "b", "c", 4, 5, k=1.0, z=6) == 1
+        assert mod.foo(b=None, a=2, c=None, k=1.0) == 2
+        assert mod.Bar().bar(3) == 3
+        with expected(tc.InputParameterError("foo() has got an incompatible value for a: 1.0")):
+            mod.foo(1.0, "b", k=1.0)
+        with expected(tc.InputParameterError("foo() has got an incompatible value for a: 1.0")):
+            mod.foo(b="b", a=1.0, k=1.0)
+        with expected(tc.InputParameterError("foo() has got an incompatible value for c: 3")):
+            mod.foo(1, "b", 3, k=1.0)
+        with expected(tc.InputParameterError("foo() has got an incompatible value for k: <no value>")):
+            mod.foo(1, "b")
+        with expected(tc.ReturnValueError("foo() has returned an incompatible value: x")):
+            mod.foo.__typecheck__.check_result("x", None)
+        with expected(tc.InputParameterError("bar() has got an incompatible value for x: ''")):
+            mod.Bar().bar("")
+
+
+def test_compiled_wrappers_fall_back_when_annotations_change():
+    with tempfile.TemporaryDirectory() as dirname:
+        _write_package(dirname)
+        _import_fresh(dirname)
+        assert tcc.compile_modules(["tc_compiled_pkg"])
+        _write_package(dirname, annotation="tc.seq_of(int)")  # same lines
+        mod = _import_fresh(dirname)
+        assert _is_compiled(mod.foo)
+        assert not _is_compiled(mod.Bar.bar)
+        assert mod.Bar().bar([3]) == [3]
+        with expected(tc.InputParameterError("bar() has got an incompatible value for x: 3")):
+            mod.Bar().bar(3)
+        _write_package(dirname, annotation="str")  # same layout, other class
+        mod = _import_fresh(dirname)
+        assert _is_compiled(mod.Bar.bar)
+        assert mod.Bar().bar("3") == "3"
+        with expected(tc.InputParameterError("bar() has got an incompatible value for x: 3")):
+            mod.Bar().bar(3)
+
+
+def test_compiled_wrappers_fall_back_when_stale_or_foreign():
+    with tempfile.TemporaryDirectory() as dirname:
+        modfile = _write_package(dirname)
+        _import_fresh(dirname)
+        assert tcc.compile_modules(["tc_compiled_pkg"])
+        with open(tcc.wrapperpath(modfile), encoding="utf-8") as f:
+            compiled = f.read()
+        for broken in (compiled.replace("VERSIONS = ['", "VERSIONS = ['0.", 1),
+                       "import no_such_module\n" + compiled,
+                       compiled + "undefined_name\n",
+                       "VERSIONS = {0!r}\nWRAPPERS = 42\n".format(tcc._versions())):
+            with open(tcc.wrapperpath(modfile), "w", encoding="utf-8") as f:
+                f.write(broken)
+            mod = _import_fresh(dirname)
+            assert not _is_compiled(mod.foo)
+            with expected(tc.InputParameterError("foo() has got an incompatible value for a: 1.0")):
+                mod.foo(1.0, "b", k=1.0)
@@ -0,0 +1,45 @@
+import time
+import warnings
+
+import typecheck as tc
+import typecheck.checkstats as cs
+
+############################################################################
+
+def slow_int(value):
+    time.sleep(0.0005)
+    return isinstance(value, int)
+
+
+@tc.typecheck
+def demoted_cheap(a: slow_int):
+    pass
+
+
+@tc.typecheck
+def demoted_not(a: int):
+    time.sleep(0.001)
+
+
+def test_demotion():
+    tc.enable_demotion(ratio=5.0, warmup_calls=10, sample_rate=0.0, interval=3600.0)
+    try:
+        for i in range(10):
+            demoted_cheap(i)
+            demoted_not(i)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            cs._demotion.judge()
+            cs._demotion.judge()  # each function is judged only once
+        assert len(caught) == 1 and caught[0].category is tc.CheckDemotionWarning
+        assert __name__ + ".demoted_cheap" in str(caught[0].message)
+        assert "demoted_not" not in str(caught[0].message)
+        demoted = tc.demoted_functions()[-1]
+        assert demoted.name == __name__ + ".demoted_cheap" and demoted.ratio > 5.0
+        demoted_cheap("x")  # is not checked anymore
+        assert tc.effective_rates()[__name__ + ".demoted_cheap"] == 0.0
+        tc.set_sampling()
+        assert tc.effective_rates()[__name__ + ".demoted_cheap"] == 0.0  # stays demoted
+    finally:
+        tc.disable_demotion()
+        tc.disable_stats()
@@ -0,0 +1,78 @@
+import typecheck as tc
+import typecheck.elision as el
+import typecheck.framework as fw
+from .testhelper import expected
+
+############################################################################
+
+class counting(fw.Checker):
+    """Checks for tuples of ints and counts its checks."""
+    pure = True
+
+    def __init__(self):
+        self.count = 0
+
+    def check(self, value, namespace):
+        self.count += 1
+        return isinstance(value, (tuple, list)) and all(isinstance(v, int) for v in value)
+
+
+Ids = counting()
+
+
+@tc.typecheck
+def outer(ids: Ids) -> Ids:
+    return inner(ids)
+
+
+@tc.typecheck
+def inner(ids: Ids) -> Ids:
+    return ids
+
+
+def test_elision():
+    tc.enable_elision([outer, inner])
+    try:
+        ids = (1, 2, 3)
+        Ids.count = 0
+        assert outer(ids) is ids
+        assert Ids.count == 1  # the others are elided
+        assert outer(ids) is ids
+        assert Ids.count == 1
+        Ids.count = 0
+        ids = [1, 2]  # mutable: checked each time
+        assert outer(ids) is ids
+        assert Ids.count == 4
+        ids.append("x")
+        with expected(tc.InputParameterError("outer() has got an incompatible value for ids:")):
+            outer(ids)
+        with expected(tc.InputParameterError("outer() has got an incompatible value for ids:")):
+            outer((1, "x"))
+    finally:
+        tc.disable_elision()
+    Ids.count = 0
+    outer((1, 2, 3))
+    assert Ids.count == 4
+
+
+def test_what_is_elided():
+    ids = Ids
+    assert el._immutable((1, "a", None, 2.0)) and el._immutable(frozenset((b"x",)))
+    assert not el._immutable((1, (2,))) and not el._immutable([1])
+
+    class mystr(str): pass
+    assert not el._immutable(mystr("a"))  # may have mutable attributes
+    assert not isinstance(el._eliding(fw.Checker.create(int), int, 2), el._ElidingChecker)
+    assert not isinstance(el._eliding(fw.Checker.create(callable), callable, 2),
+                          el._ElidingChecker)  # impure
+    assert not el._immutable("x" * 257) and not el._immutable((1,) * 257)
+    assert not el._immutable(("a", b"x" * 257)) and el._immutable(("a" * 256,))
+
+    class undeclared(fw.Checker):
+        def check(self, value, namespace):
+            return True
+    assert not isinstance(el._eliding(undeclared(), ids, 2), el._ElidingChecker)
+    assert isinstance(el._eliding(tc.seq_of(tc.re("^a")), ids, 2), el._ElidingChecker)
+    assert isinstance(el._eliding(ids, ids, 2), el._ElidingChecker)
+    assert el._eliding(ids, ids, 2)._verified is el._eliding(ids, ids, 2)._verified
+    assert el._eliding(ids, ids, 2)._verified is not el._eliding(ids, ids, 1)._verified
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import typecheck as tc
+import typecheck.checkstats as cs
+
+############################################################################
+
+def slow_int(value):
+    time.sleep(0.001)
+    return isinstance(value, int)
+
+
+@tc.typecheck
+def governed_a(a: slow_int):
+    pass
+
+
+@tc.typecheck
+def governed_b(a: slow_int):
+    pass
+
+
+@tc.typecheck
+def governed_slow_body(a: int):
+    time.sleep(0.002)
+
+
+@tc.typecheck_sampled(every_nth=2)
+def governed_own(a: slow_int):
+    pass
+
+
+A = __name__ + ".governed_a"
+B = __name__ + ".governed_b"
+
+
+def test_overhead_budget():
+    tc.set_overhead_budget(0.02, interval=3600.0)  # adjust() only when called
+    try:
+        for i in range(20):
+            governed_a(i)
+            governed_b(i)
+            governed_own(i)
+        try:
+            governed_b("x")
+        except tc.InputParameterError:
+            pass
+        cs._governor.adjust()
+        rates = tc.effective_rates()
+        assert rates[A] == 0.001  # checks 1000 times longer than body: minimum
+        assert rates[B] == 1.0  # has failed recently
+        assert rates[__name__ + ".governed_own"] == 0.5  # is not governed
+        cs._governor.adjust()
+        assert tc.effective_rates()[A] == 0.001  # no calls since: no change
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+    assert tc.effective_rates()[A] == 1.0
+
+
+def test_overhead_budget_allows_full_checking_of_cheap_checks():
+    tc.set_overhead_budget(0.5, interval=3600.0)
+    try:
+        for i in range(5):
+            governed_slow_body(i)
+        cs._governor.adjust()
+        assert tc.effective_rates()[__name__ + ".governed_slow_body"] == 1.0
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+
+
+def test_overhead_budget_per_function():
+    tc.set_overhead_budget(0.02, interval=3600.0)
+    try:
+        for i in range(20):
+            governed_a(i)
+            governed_slow_body(i)
+        cs._governor.adjust()
+        rates = tc.effective_rates()
+        assert rates[__name__ + ".governed_slow_body"] == 1.0  # cheap checks
+        assert 0.001 < rates[A] < 0.2  # gets what the cheap checks leave
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+
+
+def test_allocation():
+    from typecheck.governor import _allocated
+    assert _allocated(10.0, [1.0, 2.0, 3.0]) == [1.0, 1.0, 1.0]
+    assert _allocated(6.0, [1.0, 20.0, 10.0]) == [1.0, 0.125, 0.25]
+    assert _allocated(-1.0, [0.0, 2.0]) == [1.0, 0.0]
+
+
+def test_overhead_budget_adjusts_without_checked_calls():
+    tc.set_overhead_budget(0.02, interval=0.05)
+    try:
+        governed_a(1)  # starts the background thread
+        cs._governor._states.clear()
+        time.sleep(0.3)
+        assert cs._governor._states  # adjusted since
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+
+
+def test_overhead_budget_adjusts_while_calls_are_checked():
+    tc.set_overhead_budget(0.02, interval=0.0)
+    try:
+        for i in range(3):
+            governed_a(i)
+        assert tc.effective_rates()[A] < 1.0
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+
+
+def _governor_threads():
+    return [t for t in threading.enumerate() if t.name == "typecheck governor"]
+
+
+def test_overhead_budget_thread_ends_when_replaced():
+    before = _governor_threads()  # (may still be ending)
+    tc.set_overhead_budget(0.02, interval=3600.0)
+    try:
+        barrier = threading.Barrier(8)
+
+        def first_call():
+            barrier.wait()
+            cs._governor.tick()
+        callers = [threading.Thread(target=first_call) for i in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+        threads = [t for t in _governor_threads() if t not in before]
+        assert len(threads) == 1  # however many first calls there were
+    finally:
+        tc.set_overhead_budget(None)
+        tc.disable_stats()
+    threads[0].join(5.0)
+    assert not threads[0].is_alive()  # rather than sleeping for an hour
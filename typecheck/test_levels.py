@@ -0,0 +1,80 @@
+import typecheck as tc
+import typecheck.framework as fw
+from .testhelper import expected
+
+############################################################################
+
+@tc.typecheck
+def leveled_seq(a: tc.seq_of(int), b: tc.optional({"x": tc.map_of(str, int)})=None) -> (int, str):
+    return (len(a), "s")
+
+
+@tc.typecheck
+def leveled_other(a: tc.list_of(int)):
+    pass
+
+
+LONG = [1] * 50 + ["x"] + [1] * 50
+NS = fw.TypeVarNamespace()
+
+
+def test_degrade():
+    checker = fw.Checker.create(tc.seq_of(tc.any(int, tc.list_of(int))))
+    assert checker.degrade(2) is checker
+    shallow = checker.degrade(1)
+    assert shallow.check(["x"], NS) and shallow.check((None,), NS)
+    assert not shallow.check("xyz", NS) and not shallow.check(5, NS)
+    deep = checker.degrade(3)
+    assert deep is not checker and deep.check([1, [2]] * 30, NS)
+    assert not deep.check(LONG, NS) and not deep.check([1, [2]] * 30 + [[1, "x"]], NS)
+    fixed = fw.Checker.create({"a": (int, str)})
+    assert fixed.degrade(1).check({"a": "no tuple"}, NS)
+    assert not fixed.degrade(1).check({"a": 1, "b": 2}, NS)
+    assert fixed.degrade(3).check({"a": (1, "s")}, NS)
+    assert not fixed.degrade(3).check({"a": ("s", 1)}, NS)
+    assert fw.Checker.create((int, str)).degrade(1).check(("s", 1), NS)
+    assert not fw.Checker.create((int, str)).degrade(1).check(("s", 1, 2), NS)
+    negation = tc.none(tc.seq_of(str))
+    assert negation.degrade(1) is negation
+
+
+def test_map_of_degrade():
+    mapping = dict(("k%d" % i, i) for i in range(20))
+    mapping["z"] = "x"
+    assert not tc.map_of(str, int).degrade(3).check(mapping, NS)
+    assert tc.map_of(str, int).degrade(1).check(mapping, NS)
+
+
+def test_set_check_level():
+    assert leveled_seq.__typecheck__.level == 2
+    try:
+        tc.set_check_level(1)
+        assert leveled_seq(["x"]) == (1, "s")
+        with expected(tc.InputParameterError("leveled_seq() has got an incompatible value for a: 5")):
+            leveled_seq(5)
+        tc.set_check_level(3, modules=[__name__])
+        with expected(tc.InputParameterError("leveled_seq() has got an incompatible value for a:")):
+            leveled_seq(LONG)
+        tc.set_check_level(1, functions=[leveled_seq])
+        assert leveled_seq(LONG) == (101, "s")
+        with expected(tc.InputParameterError("leveled_other() has got an incompatible value for a:")):
+            leveled_other(LONG)  # module level 3
+
+        @tc.typecheck
+        def leveled_later(a: tc.seq_of(int)):
+            pass
+        assert leveled_later.__typecheck__.level == 3
+        tc.set_check_level(None, modules=[__name__])
+        assert leveled_other.__typecheck__.level == 1  # global
+        assert leveled_seq.__typecheck__.level == 1  # own
+        tc.set_check_level(None, functions=[leveled_seq])
+        tc.set_check_level(None)
+        assert leveled_seq.__typecheck__.level == 2
+        with expected(tc.InputParameterError("leveled_seq() has got an incompatible value for a: ['x']")):
+            leveled_seq(["x"])
+    finally:
+        tc.set_check_level(None, functions=[leveled_seq])
+        tc.set_check_level(None, modules=[__name__])
+        tc.set_check_level(None)
+    with expected(tc.TypeCheckSpecificationError("the check level must be 1, 2, or 3, not 4")):
+        tc.set_check_level(4)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+import urllib.request
+
+import pytest
+
+import typecheck as tc
+import typecheck.metrics as mx
+from .testhelper import expected
+
+############################################################################
+
+@tc.typecheck
+def metrics_foo(a: int) -> int:
+    return a
+
+
+NAME = __name__ + ".metrics_foo"
+
+
+def _value(text, family):
+    for line in text.splitlines():
+        if line.startswith('{0}{{function="{1}"}} '.format(family, NAME)):
+            return float(line.split()[-1])
+    return None
+
+
+def test_metrics():
+    with tempfile.TemporaryDirectory() as directory:
+        tc.enable_metrics(directory, [metrics_foo])
+        try:
+            for i in range(5):
+                metrics_foo(i)
+            with expected(tc.InputParameterError("metrics_foo() has got an incompatible value for a: x")):
+                metrics_foo("x")
+            text = tc.render_metrics(directory)
+            assert "# TYPE typecheck_checked_calls_total counter" in text
+            assert _value(text, "typecheck_checked_calls_total") == 6
+            assert _value(text, "typecheck_check_failures_total") == 1
+            assert 0 < _value(text, "typecheck_check_seconds_total") < 1
+            tc.reset_stats()  # does not reset the counters
+            metrics_foo(1)
+            path = os.path.join(directory, "metrics.prom")
+            tc.write_metrics(directory, path)
+            with open(path) as f:
+                assert _value(f.read(), "typecheck_checked_calls_total") == 7
+            server = tc.serve_metrics(directory, 0)
+            try:
+                url = "http://127.0.0.1:{0}/metrics".format(server.server_address[1])
+                with urllib.request.urlopen(url) as response:
+                    text = response.read().decode("utf-8")
+                assert _value(text, "typecheck_checked_calls_total") == 7
+            finally:
+                server.shutdown()
+                server.server_close()
+        finally:
+            tc.disable_metrics()
+            tc.disable_stats()
+        metrics_foo(1)
+        assert _value(tc.render_metrics(directory), "typecheck_checked_calls_total") == 7
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_metrics_of_forked_processes_are_summed():
+    with tempfile.TemporaryDirectory() as directory:
+        tc.enable_metrics(directory, [metrics_foo])
+        try:
+            metrics_foo(1)
+            children = []
+            for n in range(3):
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        for i in range(10):
+                            metrics_foo(i)
+                    finally:
+                        os._exit(0)
+                children.append(pid)
+            for pid in children:
+                os.waitpid(pid, 0)
+            metrics_foo(2)
+            text = tc.render_metrics(directory)
+            assert _value(text, "typecheck_checked_calls_total") == 32
+            tc.enable_metrics(directory, [metrics_foo])  # as if the server restarted
+            metrics_foo(3)
+            files = sorted(f for f in os.listdir(directory) if f.endswith(".db"))
+            assert files == ["typecheck_{0}.db".format(os.getpid()), mx.MERGED]
+            text = tc.render_metrics(directory)
+            assert _value(text, "typecheck_checked_calls_total") == 33
+        finally:
+            tc.disable_metrics()
+            tc.disable_stats()
+
+
+@pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="needs Python 3.7+")
+def test_metrics_in_child_forked_while_lock_held():
+    with tempfile.TemporaryDirectory() as directory:
+        tc.enable_metrics(directory, [metrics_foo])
+        try:
+            with mx._reopen_lock:  # as if another thread held it at fork()
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        metrics_foo(1)
+                    finally:
+                        os._exit(0)
+            for i in range(500):
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    break
+                time.sleep(0.01)
+            else:
+                os.kill(pid, 9)
+                os.waitpid(pid, 0)
+                raise AssertionError("the child deadlocked")
+            assert _value(tc.render_metrics(directory), "typecheck_checked_calls_total") == 1
+        finally:
+            tc.disable_metrics()
+            tc.disable_stats()
@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+import typecheck as tc
+from .testhelper import expected
+
+np = pytest.importorskip("numpy")
+
+############################################################################
+
+def test_ndarray_metadata():
+    ns = None
+    a = np.zeros((10, 3))
+    assert tc.ndarray().check(a, ns)
+    assert not tc.ndarray().check([1.0, 2.0], ns)
+    assert tc.ndarray(dtype=np.float64).check(a, ns)
+    assert tc.ndarray(dtype="f8").check(a, ns)
+    assert not tc.ndarray(dtype=np.float32).check(a, ns)
+    assert tc.ndarray(dtype=np.floating).check(a.astype(np.float32), ns)
+    assert not tc.ndarray(dtype=np.floating).check(a.astype(int), ns)
+    assert tc.ndarray(shape=(None, 3)).check(a, ns)
+    assert tc.ndarray(shape=(10, None)).check(a, ns)
+    assert not tc.ndarray(shape=(None, 2)).check(a, ns)
+    assert not tc.ndarray(shape=(None,)).check(a, ns)
+    assert tc.ndarray(ndim=2).check(a, ns)
+    assert not tc.ndarray(ndim=1).check(a, ns)
+    assert tc.ndarray(contiguous=True).check(a, ns)
+    assert not tc.ndarray(contiguous="C").check(a.T, ns)
+    assert tc.ndarray(contiguous="F").check(a.T, ns)
+    assert not tc.ndarray(contiguous="C").check(a[:, 1], ns)
+
+
+def test_ndarray_content():
+    ns = None
+    a = np.arange(12.0).reshape(3, 4)
+    assert tc.ndarray(min=0, max=11).check(a, ns)
+    assert not tc.ndarray(min=1).check(a, ns)
+    assert not tc.ndarray(max=10.5).check(a, ns)
+    assert tc.ndarray(finite=True).check(a, ns)
+    a[1, 1] = np.nan
+    assert not tc.ndarray(finite=True).check(a, ns)
+    assert not tc.ndarray(min=0).check(a, ns)
+    a[1, 1] = np.inf
+    assert not tc.ndarray(finite=True).check(a, ns)
+    assert tc.ndarray(min=0).check(a, ns)
+    assert tc.ndarray(min=0, max=1, finite=True).check(np.zeros((0, 3)), ns)
+    assert not tc.ndarray(finite=True).check(np.array(["a"], dtype=object), ns)
+    shallow = tc.ndarray(ndim=2, min=0, finite=True).degrade(1)
+    assert shallow.check(a, ns) and not shallow.check(np.zeros(3), ns)
+    assert tc.ndarray(ndim=2).degrade(1).degrade(3).check(a, ns)
+
+
+def test_ndarray_in_function():
+    @tc.typecheck
+    def foo_nd(points: tc.ndarray(dtype=np.floating, shape=(None, 3),
+                                  finite=True)) -> tc.ndarray(ndim=1):
+        return points[:, 0]
+
+    assert foo_nd(np.zeros((10, 3))).shape == (10,)
+    with expected(tc.InputParameterError("foo_nd() has got an incompatible value for points")):
+        foo_nd(np.zeros((10, 2)))
+
+
+def test_ndarray_pickle():
+    checker = tc.ndarray(dtype="i4", shape=(2, None), min=0)
+    copy = pickle.loads(pickle.dumps(checker))
+    assert copy.check(np.ones((2, 5), dtype="i4"), None)
+    assert not copy.check(-np.ones((2, 5), dtype="i4"), None)
@@ -0,0 +1,142 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+import typecheck as tc
+from .testhelper import expected
+
+############################################################################
+
+@tc.typecheck
+def policed_deep(a: tc.seq_of(int)):
+    pass
+
+
+@tc.typecheck
+def policed_other(a: int):
+    pass
+
+
+LONG = [1] * 50 + ["x"] + [1] * 50
+
+POLICY = """
+[{0}.*]
+level = 3
+stats = yes
+
+[{0}.policed_other]
+every_nth = 2
+shadow = on
+"""
+
+
+def _write(directory, text):
+    path = os.path.join(directory, "policy.ini")
+    with open(path, "w") as f:
+        f.write(text.format(__name__))
+    return path
+
+
+def test_policy():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write(directory, POLICY)
+        tc.load_policy(path)
+        try:
+            deep, other = policed_deep.__typecheck__, policed_other.__typecheck__
+            assert deep.level == 3 and deep.stats is not None and other.stats is not None
+            with expected(tc.InputParameterError("policed_deep() has got an incompatible value for a:")):
+                policed_deep(LONG)
+            assert other.sampler.sampling.every_nth == 2 and other.shadow
+
+            @tc.typecheck
+            def policed_later(a: int):
+                pass
+            assert policed_later.__typecheck__.level == 3
+            _write(directory, "[{0}.policed_deep]\nlevel = 1\n")
+            tc.reload_policy()
+            assert deep.level == 1 and deep.stats is None
+            assert other.level == 2 and other.stats is None
+            assert other.sampler is None and not other.shadow
+        finally:
+            _write(directory, "")
+            tc.reload_policy()
+        assert policed_deep.__typecheck__.level == 2
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="needs SIGHUP")
+def test_policy_reload_on_signal():
+    previous = signal.getsignal(signal.SIGHUP)
+    with tempfile.TemporaryDirectory() as directory:
+        tc.load_policy(_write(directory, ""))
+        try:
+            tc.reload_policy_on_signal()
+            _write(directory, "[{0}]\nlevel = 1\n")
+            os.kill(os.getpid(), signal.SIGHUP)
+            for i in range(100):
+                if policed_other.__typecheck__.level == 1:
+                    break
+                time.sleep(0.01)
+            assert policed_other.__typecheck__.level == 1
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+            _write(directory, "")
+            tc.reload_policy()
+
+
+def test_policy_concurrent_reloads():
+    with tempfile.TemporaryDirectory() as directory:
+        tc.load_policy(_write(directory, POLICY))
+        try:
+            reloads = [threading.Thread(target=tc.reload_policy) for i in range(8)]
+            for reload in reloads:
+                reload.start()
+            for reload in reloads:
+                reload.join()
+            assert policed_deep.__typecheck__.level == 3
+        finally:
+            _write(directory, "")
+            tc.reload_policy()
+        assert policed_deep.__typecheck__.level == 2  # undone, however often applied
+        assert policed_other.__typecheck__.sampler is None
+
+
+def test_policy_errors():
+    with tempfile.TemporaryDirectory() as directory:
+        with expected(tc.TypeCheckSpecificationError("invalid setting level = '7'")):
+            tc.load_policy(_write(directory, "[x]\nlevel = 7\n"))
+        with expected(tc.TypeCheckSpecificationError("invalid setting colour = 'blue'")):
+            tc.load_policy(_write(directory, "[x]\ncolour = blue\n"))
+        with expected(tc.TypeCheckSpecificationError("sampling needs sample_rate or every_nth, not both")):
+            tc.load_policy(_write(directory, "[x]\nsample_rate = 0.1\nevery_nth = 3\n"))
+
+
+def test_policy_undo_keeps_later_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        tc.load_policy(_write(directory, POLICY))
+        try:
+            tc.set_check_level(1, functions=[policed_deep])
+            _write(directory, "")
+            tc.reload_policy()
+            assert policed_deep.__typecheck__.level == 1  # not the level before the policy
+            assert policed_other.__typecheck__.level == 2
+        finally:
+            tc.set_check_level(None, functions=[policed_deep])
+            _write(directory, "")
+            tc.reload_policy()
+        assert policed_deep.__typecheck__.level == 2
+
+
+def test_policy_from_environment_with_errors():
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, TYPECHECK_POLICY=_write(directory, "[x]\nlevel = 7\n"),
+                   PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(tc.__file__))))
+        result = subprocess.run([sys.executable, "-c", "import typecheck"], env=env,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+        assert result.returncode == 0
+        assert "ignoring policy file" in result.stderr and "level = '7'" in result.stderr
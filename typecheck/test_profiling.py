@@ -0,0 +1,66 @@
+import time
+
+import typecheck as tc
+import typecheck.framework as fw
+from .testhelper import expected
+
+############################################################################
+
+def slow_check(value):
+    time.sleep(0.001)
+    return value > 0
+
+
+@tc.typecheck
+def prof_foo(a: tc.seq_of(tc.any(str, slow_check)), *, k: tc.optional(int)=None) -> tc.optional(int):
+    return None
+
+
+def _find(node, checker_name):
+    if node["checker"].startswith(checker_name):
+        return node
+    for child in node["children"]:
+        found = _find(child, checker_name)
+        if found is not None:
+            return found
+    return None
+
+
+def test_profile_function():
+    with tc.profile_checks(prof_foo) as profile:
+        prof_foo([1, "x", 2])
+        prof_foo([], k=1)
+        with expected(tc.InputParameterError("prof_foo() has got an incompatible value for a: [-1]")):
+            prof_foo([-1])
+    roots = profile.as_dict()
+    assert [(r["label"], r["calls"]) for r in roots] == [("a", 3), ("k", 2), ("return", 2)]
+    a = roots[0]
+    anyof = _find(a, "any")
+    assert anyof["calls"] == 4  # 1, "x", 2, -1
+    call = _find(anyof, "CallableChecker")
+    assert call["calls"] == 3  # "x" is accepted by str first
+    assert call["self"] >= 0.003 > anyof["self"]
+    assert a["total"] >= anyof["total"] >= call["total"]
+    report = profile.report()
+    assert "a: seq_of" in report and "TypeChecker(str)" in report
+    # the profiling has ended:
+    assert all("check" not in c.__dict__ for c in prof_foo.__typecheck__.checkers())
+    prof_foo([1])
+    assert profile.as_dict()[0]["calls"] == 3
+
+
+def test_profile_validator_and_checker():
+    validator = tc.Validator(tc.map_of(str, tc.seq_of(int)))
+    with tc.profile_checks(validator) as profile:
+        assert validator.check(dict(a=[1, 2]))
+        assert not validator.check(dict(a=["b"]))
+    root = profile.as_dict()[0]
+    assert root["label"] == "" and root["calls"] == 2
+    assert _find(root, "seq_of")["calls"] == 2
+    checker = fw.Checker.create(tc.any(int, str))
+    with tc.profile_checks(checker) as profile:
+        assert checker(1, fw.TypeVarNamespace())
+    assert profile.as_dict()[0]["calls"] == 1
+    with expected(TypeError("can only profile @typecheck-decorated functions, "
+                            "Validators, and checkers, not 1")):
+        tc.profile_checks(1)
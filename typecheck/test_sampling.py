@@ -0,0 +1,81 @@
+import typecheck as tc
+from .testhelper import expected
+
+############################################################################
+
+def _checked_calls(function, calls):
+    """Returns the numbers of the calls (with a wrong argument) that were checked."""
+    result = []
+    for i in range(calls):
+        try:
+            function("x")
+        except tc.InputParameterError:
+            result.append(i)
+    return result
+
+
+@tc.typecheck_sampled(every_nth=3)
+def sampled_every_third(a: int):
+    pass
+
+
+@tc.typecheck_sampled(first_n=2, every_nth=4)
+def sampled_first_two(a: int):
+    pass
+
+
+@tc.typecheck_sampled(first_n=3)
+def sampled_first_three_only(a: int):
+    pass
+
+
+@tc.typecheck
+def sampled_by_policy(a: int):
+    pass
+
+
+def test_every_nth_and_first_n():
+    assert _checked_calls(sampled_every_third, 9) == [2, 5, 8]
+    assert _checked_calls(sampled_first_two, 10) == [0, 1, 5, 9]
+    assert _checked_calls(sampled_first_three_only, 100) == [0, 1, 2]
+    assert sampled_every_third(1) is None
+
+
+def sampled_plain(a: int):
+    pass
+
+
+def test_sample_rate():
+    calls = _checked_calls(tc.typecheck_sampled(sample_rate=0.1, seed=4)(sampled_plain), 5000)
+    assert 350 < len(calls) < 650
+    again = _checked_calls(tc.typecheck_sampled(sample_rate=0.1, seed=4)(sampled_plain), 5000)
+    assert calls == again  # same seed, same function name
+    assert _checked_calls(tc.typecheck_sampled(sample_rate=0.0)(sampled_plain), 100) == []
+    assert len(_checked_calls(tc.typecheck_sampled(sample_rate=1.0)(sampled_plain), 100)) == 100
+
+
+def test_global_sampling():
+    tc.set_sampling(every_nth=2)
+    try:
+        assert _checked_calls(sampled_by_policy, 4) == [1, 3]
+        assert sampled_every_third.__typecheck__.sampler.sampling.every_nth == 3  # its own
+
+        @tc.typecheck
+        def sampled_later(a: int):
+            pass
+        assert _checked_calls(sampled_later, 4) == [1, 3]
+    finally:
+        tc.set_sampling()
+    assert _checked_calls(sampled_by_policy, 3) == [0, 1, 2]
+    assert sampled_by_policy.__typecheck__.sampler is None
+
+
+def test_sampling_specification_errors():
+    with expected(tc.TypeCheckSpecificationError("sampling needs sample_rate or every_nth, not both")):
+        tc.typecheck_sampled(sample_rate=0.5, every_nth=2)
+    with expected(tc.TypeCheckSpecificationError("sampling needs sample_rate, every_nth, or first_n")):
+        tc.Sampling()
+    with expected(tc.TypeCheckSpecificationError("sample_rate must be between 0 and 1, not 2")):
+        tc.Sampling(sample_rate=2)
+    with expected(tc.TypeCheckSpecificationError("every_nth must be a positive integer, not 0")):
+        tc.Sampling(every_nth=0)
@@ -0,0 +1,104 @@
+import logging
+
+import typecheck as tc
+import typecheck.shadow as sh
+
+############################################################################
+
+@tc.typecheck
+def shadowed(a: int, b: str="") -> int:
+    return a
+
+
+NAME = __name__ + ".shadowed"
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_shadow_mode():
+    logger = logging.getLogger("test_shadow")
+    logger.propagate = False
+    handler = ListHandler()
+    logger.addHandler(handler)
+    tc.enable_shadow_mode([shadowed], capacity=3, repr_limit=20, logger=logger,
+                          log_interval=3600.0)
+    try:
+        for i in range(5):
+            assert shadowed("x" * 100, b=i) == "x" * 100
+        assert shadowed(1) == 1
+        violations = tc.drain_violations()
+        assert [(v.parameter, v.value_type, v.count) for v in violations] == [
+            ("a", "builtins.str", 5), ("b", "builtins.int", 5), ("return", "builtins.str", 5)]
+        assert violations[0].function == NAME
+        assert len(violations[0].value_repr) <= 20 and violations[0].value_repr.startswith("'xxx")
+        assert tc.drain_violations() == []
+        assert len(handler.messages) == 3  # once per entry per log_interval
+        assert handler.messages[1] == (NAME + "() has got an incompatible value for b: 0 "
+                                       "(type builtins.int, 1 times)")
+        shadowed(1.0, b=b"")
+        shadowed(None)  # two more entries: the two oldest are dropped
+        assert sh._buffer.dropped == 2
+        assert [(v.parameter, v.value_type) for v in tc.drain_violations()] == [
+            ("return", "builtins.float"), ("a", "builtins.NoneType"),
+            ("return", "builtins.NoneType")]
+    finally:
+        tc.disable_shadow_mode()
+        logger.removeHandler(handler)
+    try:
+        shadowed("x")
+    except tc.InputParameterError:
+        pass
+    else:
+        assert False, "no longer in shadow mode"
+
+
+def test_shadow_mode_keeps_frequent_violations():
+    tc.enable_shadow_mode([shadowed], capacity=4)
+    try:
+        shadowed("x")
+        shadowed(1, b=2)
+        shadowed("y")  # updates the two entries of "x"
+        shadowed(1.5)  # two new entries: the oldest update (b) is dropped
+        assert [(v.parameter, v.value_type, v.count) for v in tc.drain_violations()] == [
+            ("a", "builtins.str", 2), ("return", "builtins.str", 2),
+            ("a", "builtins.float", 1), ("return", "builtins.float", 1)]
+    finally:
+        tc.disable_shadow_mode()
+
+
+def test_shadowed_violations_are_failures():
+    tc.enable_shadow_mode([shadowed])
+    tc.enable_stats([shadowed])
+    try:
+        shadowed(1)
+        shadowed("x")  # the argument and the result violate
+        shadowed(2)
+        shadowed(3, b=4)
+        assert shadowed.__typecheck__.stats.counts()[:2] == (4, 2)
+    finally:
+        tc.disable_stats([shadowed])
+        tc.disable_shadow_mode()
+        tc.drain_violations()
+
+
+class ReprCallsShadowed:
+    def __repr__(self):
+        shadowed(1, b=3)  # violates, too
+        return "ReprCallsShadowed()"
+
+
+def test_shadow_mode_calls_repr_without_lock():
+    tc.enable_shadow_mode([shadowed])
+    try:
+        shadowed(ReprCallsShadowed())  # would deadlock with the lock held
+        violations = [(v.parameter, v.value_repr) for v in tc.drain_violations()]
+        assert ("a", "ReprCallsShadowed()") in violations and ("b", "3") in violations
+    finally:
+        tc.disable_shadow_mode()
@@ -0,0 +1,42 @@
+import functools
+import inspect
+
+import typecheck as tc
+import typecheck.signature as sg
+from .testhelper import expected
+
+############################################################################
+
+def plain(a, b: int, c=1, *args: str, d, e: float=2.0, **kwargs) -> bool:
+    return True
+
+
+def nothing():
+    pass
+
+
+class Bar:
+    def bar(self, x: tc.optional(str)=None):
+        return x
+
+
+def test_getfullargspec_like_inspect():
+    for function in (plain, nothing, Bar.bar, Bar().bar, lambda x, *, y=1: x,
+                     functools.partial(plain, 1)):
+        expected_spec = inspect.getfullargspec(function)
+        spec = sg.getfullargspec(function)
+        for field in sg.ArgSpec._fields:
+            assert getattr(spec, field) == getattr(expected_spec, field), (function, field)
+
+
+def test_getfullargspec_does_without_inspect(monkeypatch):
+    def no_introspection(*args):
+        raise AssertionError("getfullargspec should not have been called")
+    monkeypatch.setattr(inspect, "getfullargspec", no_introspection)
+
+    @tc.typecheck
+    def foo(a: int, b=2, *, c: str="c") -> int:
+        return a + b
+    assert foo(1, c="x") == 3
+    with expected(tc.InputParameterError("foo() has got an incompatible value for c: 3")):
+        foo(1, c=3)
@@ -2,9 +2,14 @@
 # http://www.targeted.org/python/recipes/typecheck3000.py
 # reworked into py.test tests
 
+import array
 import collections
 import functools
+import mmap
+import pickle
 import random
+import tempfile
+import threading
 
 import typecheck as tc
 from .testhelper import expected
@@ -240,6 +245,81 @@ def test_has1():
     assert not tc.re(b"^abc$")(b"abcx", namespace)
 
 
+def test_re_on_buffers():
+    namespace = None
+    for make in (bytearray, memoryview, lambda b: memoryview(bytearray(b))):
+        assert tc.re(b"^abc$")(make(b"abc"), namespace)
+        assert not tc.re(b"^abc$")(make(b"abc\n"), namespace)
+        assert not tc.re(b"^abc$")(make(b"abcx"), namespace)
+        assert tc.re(b"b")(make(b"abc\n"), namespace)
+        assert not tc.re("^abc$")(make(b"abc"), namespace)
+    assert not tc.re(b"abc")(array.array("d", [1.0]), namespace)
+    with tempfile.TemporaryFile() as f:
+        f.write(b"x" * 100000 + b"LOG\n")
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert tc.re(b"LOG")(mapped, namespace)
+            assert not tc.re(b"LOG$")(mapped, namespace)
+            assert tc.re(b"LOG\n")(mapped, namespace)
+            assert not tc.re(b"LOG", max_scan=1000)(mapped, namespace)
+            assert tc.re(b"^x+", max_scan=1000)(mapped, namespace)
+        assert not tc.re(b"x")(mapped, namespace)  # closed
+
+
+def test_re_on_unsearchable_buffers():
+    namespace = None
+    strided = memoryview(b"abc")[::2]  # not contiguous
+    released = memoryview(b"abc")
+    released.release()
+    for value in (strided, released, memoryview(bytes(6)).cast("B", (2, 3))):
+        for regex in (b"b", b"^a", b"c$"):
+            assert not tc.re(regex)(value, namespace)
+            assert not tc.re(regex, max_scan=2)(value, namespace)
+
+
+def test_re_max_scan():
+    namespace = None
+    assert tc.re("b", max_scan=2)("abc", namespace)
+    assert not tc.re("c", max_scan=2)("abc", namespace)
+    assert tc.re("^ab$", max_scan=2)("ab", namespace)
+    assert not tc.re("^ab$", max_scan=2)("abc", namespace)  # not just "ab" in window
+    assert not tc.re("^a.$", max_scan=2)("abc", namespace)
+    assert tc.re(b"^ab", max_scan=2)(b"abc", namespace)
+
+
+def test_re_cache():
+    namespace = None
+    uncached = tc.re("^[a-z]+$")
+    assert uncached.cache_info() == (0, 0, 0, 0)
+    checker = tc.re("^[a-z]+$", cache_size=2, cache_max_len=5)
+    for value in ("abc", "abc", "x1", "abc", "x1", "def", "abc"):
+        assert checker(value, namespace) == uncached(value, namespace)
+    assert checker.cache_info() == tc.tc_predicates.CacheInfo(3, 4, 2, 2)
+    assert checker("abc", namespace)  # recently used, hence still cached
+    assert checker("x1", namespace) is False  # was evicted
+    assert checker.cache_info() == (4, 5, 2, 2)
+    assert checker("abcdefgh", namespace)  # too long for the cache
+    assert not checker(b"abc", namespace)
+    assert checker.cache_info() == (4, 5, 2, 2)
+    fifo = tc.re("^[a-z]+$", cache_size=2, cache_policy="fifo")
+    for value in ("abc", "def", "abc", "ghi", "abc"):
+        fifo(value, namespace)
+    assert fifo.cache_info() == (1, 4, 2, 2)  # "abc" was evicted nevertheless
+    checker.cache_clear()
+    assert checker.cache_info() == (0, 0, 2, 0)
+
+
+def test_re_cache_pickled_and_frozen():
+    checker = tc.re(b"^a", cache_size=10)
+    assert checker(b"abc", None) and checker(b"abc", None)
+    copy = pickle.loads(pickle.dumps(checker))
+    assert copy.cache_info() == (0, 0, 10, 0)
+    assert copy(b"abc", None) and not copy(b"cba", None)
+    checker.freeze()
+    assert checker(b"abc", None) and not checker(b"xyz", None)
+    assert checker.cache_info() == (1, 1, 10, 1)
+
+
 def test_has2():
     @tc.typecheck
     def foo(*, k: tc.re("^[0-9A-F]+$")) -> tc.re("^[0-9]+$"):
@@ -305,6 +385,33 @@ def test_has6():
     assert not tc.re("^123$").check("foo", namespace)
 
 
+def test_buffer():
+    namespace = None
+    assert tc.buffer()(b"abc", namespace)
+    assert not tc.buffer()("abc", namespace)
+    assert not tc.buffer()([1, 2], namespace)
+    assert tc.buffer(format="B", itemsize=1, ndim=1)(bytearray(3), namespace)
+    assert tc.buffer(readonly=True)(b"abc", namespace)
+    assert not tc.buffer(readonly=True)(bytearray(b"abc"), namespace)
+    assert tc.buffer(readonly=False)(memoryview(bytearray(3)), namespace)
+    assert tc.buffer(min_len=3, max_len=3)(b"abc", namespace)
+    assert not tc.buffer(min_len=4)(b"abc", namespace)
+    assert not tc.buffer(max_len=2)(b"abc", namespace)
+    doubles = array.array("d", [1.0, 2.0])
+    assert tc.buffer(format="d", itemsize=8, max_len=2)(doubles, namespace)
+    assert not tc.buffer(format="B")(doubles, namespace)
+    assert tc.buffer(ndim=2, min_len=6)(memoryview(bytes(6)).cast("B", (2, 3)), namespace)
+    grown = bytearray(b"abc")
+    assert tc.buffer()(grown, namespace)
+    grown.extend(b"def")  # the buffer has been released
+    with tempfile.TemporaryFile() as f:
+        f.write(bytes(10000))
+        f.flush()
+        with mmap.mmap(f.fileno(), 0) as mapped:
+            assert tc.buffer(format="B", min_len=10000, readonly=False)(mapped, namespace)
+            mapped.close()  # would fail if the buffer were still exported
+
+
 def test_seq_of_simple():
     @tc.typecheck
     def foo_s(x: tc.seq_of(int)) -> tc.seq_of(float):
@@ -319,6 +426,42 @@ def test_seq_of_simple():
         foo_s(1)
 
 
+def test_seq_of_sampling_uses_its_own_random_per_thread():
+    checker = tc.seq_of(int)
+    values = list(range(100))
+    state = random.getstate()
+    assert checker.check(values, None)
+    assert random.getstate() == state  # module random is left alone
+    generators = []
+    failures = []
+    def sample():
+        for i in range(200):
+            if not checker.check(values, None) or checker.check(values + ["x"], None):
+                failures.append(i)
+        generators.append(tc.tc_predicates._random())
+    threads = [threading.Thread(target=sample) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert failures == []
+    assert len(set(map(id, generators))) == 8
+
+
+def test_seq_of_and_map_of_checkonly_None_checks_all():
+    values = list(range(1000))
+    values[500] = "x"
+    for i in range(20):
+        assert not tc.seq_of(int, checkonly=None).check(values, None)
+        assert not tc.list_of(int, checkonly=None).check(values, None)
+    mapping = {i: i for i in range(1000)}
+    mapping[500] = "x"
+    assert not tc.map_of(int, int, checkonly=None).check(mapping, None)
+    del mapping[500]
+    assert tc.map_of(int, int, checkonly=None).check(mapping, None)
+    assert tc.seq_of(int, checkonly=None).check(list(range(1000)), None)
+
+
 def test_list_of_simple():
     @tc.typecheck
     def foo_l(x: tc.list_of(int)) -> tc.list_of(float):
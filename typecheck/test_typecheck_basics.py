@@ -2,8 +2,14 @@
 # http://www.targeted.org/python/recipes/typecheck3000.py
 # reworked into py.test tests
 
+import concurrent.futures
+import functools
+import os
+import pickle
 import random
 import re
+import subprocess
+import sys
 import time
 from traceback import extract_stack
 
@@ -754,6 +760,189 @@ def test_disable():
         tc.enable()  # make sure typecheck continues to work!
 
 
+def test_warmup():
+    prepared = []
+
+    class LazyChecker(typecheck.framework.Checker):
+        def __init__(self):
+            self._inner = None
+
+        def prepare(self):
+            if self._inner is None:
+                self._inner = typecheck.framework.TypeChecker(int)
+                prepared.append(self)
+
+        def check(self, value, namespace):
+            self.prepare()
+            return self._inner.check(value, namespace)
+
+    @tc.typecheck
+    def foo(a: tc.optional(LazyChecker()), b: tc.seq_of(int)) -> tc.any(str, LazyChecker()):
+        return a
+
+    assert tc.warmup(modules=[__name__], freeze=False) >= 1
+    assert len(prepared) == 2
+    assert not any(c._frozen for c in foo.__typecheck__.checkers())
+    try:
+        assert tc.warmup(modules=[__name__])
+    finally:
+        import gc
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
+    checkers = [c for top in foo.__typecheck__.checkers() for c in top.walk()]
+    assert len(checkers) == 9
+    assert all(c._frozen for c in checkers)
+    assert foo(1, [2]) == 1
+    with expected(tc.InputParameterError("foo() has got an incompatible value for a: 1.0")):
+        foo(1.0, [2])
+
+
+def test_import_is_lazy():
+    script = ("import sys; before = set(sys.modules); import typecheck; "
+              "print(' '.join(set(sys.modules) - before))")
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    imported = subprocess.check_output([sys.executable, "-c", script],
+                                       cwd=here, universal_newlines=True).split()
+    for deferred in ("typing", "random", "re", "inspect", "numpy", "mmap", "http.server",
+                     "typecheck.typing_predicates"):
+        assert deferred not in imported
+
+
+def test_warmup_keeps_typing_support_deferred():
+    script = ("import sys; import typecheck as tc; "
+              "exec('@tc.typecheck\\ndef g(a: int) -> int: return a'); "
+              "print(tc.warmup(), 'typecheck.typing_predicates' in sys.modules)")
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     cwd=here, universal_newlines=True)
+    assert output.split() == ["1", "False"]
+
+
+def test_prepend_keeps_typing_support_deferred():
+    script = ("import sys; import typecheck.framework as fw; "
+              "fw.Checker.register(lambda a: a == 'mine', lambda a: 'my checker', prepend=True); "
+              "print('typecheck.typing_predicates' in sys.modules); "
+              "import typing; fw.Checker.create(typing.List[int]); "
+              "print(fw.Checker.create('mine'))")  # not a TypeNameChecker
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     cwd=here, universal_newlines=True)
+    assert output.split() == ["False", "my", "checker"]
+
+
+@tc.typecheck
+def pickled_foo(a: int, b: tc.optional(tc.seq_of(str))=None) -> int:
+    return a
+
+
+class PickledBar:
+    @tc.typecheck
+    def bar(self, x: tc.re("^b")) -> str:
+        return x
+
+
+def test_pickle_decorated_functions():
+    assert pickled_foo.__qualname__ == "pickled_foo"
+    assert pickle.loads(pickle.dumps(pickled_foo)) is pickled_foo
+    assert pickle.loads(pickle.dumps(PickledBar.bar)) is PickledBar.bar
+    assert pickle.loads(pickle.dumps(PickledBar().bar))("bx") == "bx"
+
+
+def test_pickle_checkers():
+    no_value = typecheck.framework.Checker.no_value
+    assert pickle.loads(pickle.dumps(no_value)) is no_value
+    checkers = [tc.optional(int), tc.seq_of(tc.any(int, str), checkonly=6),
+                tc.map_of(str, (int, float)), tc.re("^a+$"), tc.hasattrs("x"),
+                tc.range(1, 5), tc.enum(1, "2"), tc.all(int, tc.none(bool)),
+                tc.list_of(tc.anything), tc.optional({"a": [int]})]
+    checkers.extend(pickled_foo.__typecheck__.checkers())
+    for checker in checkers:
+        copy = pickle.loads(pickle.dumps(checker))
+        assert type(copy) is type(checker)
+        for value in (None, no_value, 3, "aa", ["x"], {"a": 1}, [7, "7"]):
+            assert copy.check(value, None) == checker.check(value, None)
+
+
+def test_unpickled_checkers_in_fresh_process():
+    # (no __init__ runs upon unpickling, so checkers may not rely on it)
+    script = ("import pickle, sys; checker = pickle.loads(sys.stdin.buffer.read()); "
+              "print(checker.check(list(range(10)), None), checker.check(['x'] * 10, None))")
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=here,
+                                     input=pickle.dumps(tc.seq_of(int)))
+    assert output.split() == [b"True", b"False"]
+
+
+def test_checked_functions_in_process_pool():
+    with concurrent.futures.ProcessPoolExecutor(2) as pool:
+        assert list(pool.map(pickled_foo, [1, 2, 3])) == [1, 2, 3]
+        assert pool.submit(pickled_foo, 4, b=["x"]).result() == 4
+        assert pool.submit(PickledBar().bar, "b").result() == "b"
+        with expected(tc.InputParameterError("pickled_foo() has got an incompatible value for b: [1]")):
+            pool.submit(pickled_foo, 1, [1]).result()
+        with expected(tc.InputParameterError("bar() has got an incompatible value for x: a")):
+            pool.submit(PickledBar().bar, "a").result()
+
+
+############################################################################
+
+def test_lru_cache():
+    calls = []
+
+    @tc.typecheck
+    @functools.lru_cache(maxsize=8)
+    def everytime(a: int) -> str:
+        calls.append(a)
+        return "x" * a
+
+    assert everytime(2) == "xx" and everytime(2) == "xx"
+    assert calls == [2] and everytime.cache_info().hits == 1
+    with expected(tc.InputParameterError("everytime() has got an incompatible value for a: 2.0")):
+        everytime(2.0)  # checked although it would hit the cache
+    everytime.cache_clear()
+    assert everytime.cache_info().currsize == 0
+
+
+def test_lru_cache_misses_only():
+    calls = []
+
+    @tc.typecheck_cache_misses
+    @functools.lru_cache(maxsize=8)
+    def onmiss(a: int) -> str:
+        calls.append(a)
+        return "x" * a if a >= 0 else None
+
+    tc.enable_stats([onmiss])
+    try:
+        assert onmiss(2) == "xx" and onmiss(2) == "xx" and onmiss(3) == "xxx"
+        assert calls == [2, 3] and onmiss.cache_info().hits == 1
+        assert onmiss.__typecheck__.stats.counts()[0] == 2  # the misses only
+        assert onmiss.cache_info().maxsize == 8
+        with expected(tc.InputParameterError("onmiss() has got an incompatible value for a: 2.0")):
+            onmiss(2.0)  # the cache is typed: not a hit
+        with expected(tc.ReturnValueError("onmiss() has returned an incompatible value: None")):
+            onmiss(-1)
+    finally:
+        tc.disable_stats([onmiss])
+    with expected(tc.TypeCheckSpecificationError("uncached is not wrapped by functools.lru_cache")):
+        @tc.typecheck_cache_misses
+        def uncached(a: int):
+            pass
+
+
+def test_lru_cache_misses_only_with_unhashable_arguments():
+    @tc.typecheck_cache_misses
+    @functools.lru_cache(maxsize=8)
+    def onmiss(a: int, b: tc.optional(list) = None) -> int:
+        return a
+
+    assert onmiss(1) == 1 and onmiss.cache_info().misses == 1
+    with expected(tc.InputParameterError("onmiss() has got an incompatible value for a: [1]")):
+        onmiss([1])  # checked, although the cache cannot hash it
+    with expected(TypeError("unhashable type: 'list'")):
+        onmiss(1, b=[])  # well-typed: the cache's own error
+    assert onmiss.cache_info().misses == 1
+
 ############################################################################
 
 
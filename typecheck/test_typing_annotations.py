@@ -1,9 +1,11 @@
 import builtins
 import datetime as dt
 import io
+import pickle
 import re
 import sys
 import tempfile
+import threading
 
 import typing as tg
 
@@ -66,6 +68,12 @@ def test_Sequence_int_with_wrong_result():
             "has returned an incompatible value: [1, '2']")):
         foo_Sequence_int_to_List_int([1], "2")
 
+def test_warmup_builds_generic_dispatch_tables():
+    checker = foo_Sequence_int_to_List_int.__typecheck__.arg_checkers[0][1]
+    assert tc.warmup(modules=[__name__], freeze=False) > 0
+    assert checker._dispatch is not None
+    assert checker.check([1, 2], fw.TypeVarNamespace())
+
 ############################################################################
 # Generic stand-alone functions
 
@@ -91,6 +99,53 @@ def foo_Sequence_X_to_Sequence_X(xs: tg.Sequence[X], x: X) -> tg.Sequence[X]:
     xs.append(x)
     return xs
 
+def test_Validator_forgets_TypeVar_bindings_between_values():
+    v = tc.Validator(tg.Sequence[X])
+    assert v.check_many([[1, 2], ["a", "b"], [1, "b"], [3.0]]) == [2]
+    assert v.first_failure([[1, 2], ["a", "b"], [1, "b"], [3.0]]) == 2
+
+def test_degrade_typing_tree():
+    ns = fw.TypeVarNamespace()
+    checker = fw.Checker.create(tg.List[tg.Dict[str, int]])
+    shallow, deep = checker.degrade(1), checker.degrade(3)
+    assert shallow.check([{"a": "not an int"}], ns) and not shallow.check({}, ns)
+    many = [{"a": 1}] * 20 + [{"a": 1, "b": "x"}] + [{"a": 1}] * 20
+    assert deep.check([{"a": 1}] * 41, ns) and not deep.check(many, ns)
+    assert fw.Checker.create(tg.Tuple[int, str]).degrade(1).check(("x", 1), ns)
+    union = fw.Checker.create(tg.Union[int, tg.List[int]]).degrade(1)
+    assert union.check(["x"], ns) and not union.check("x", ns)
+
+class LateX:
+    """An iterable (but not a sequence) with a bad element late."""
+    def __iter__(self):
+        return iter([1] * 10 + ["x"])
+
+def test_degrade_iterable_checks_all_but_iterators():
+    ns = fw.TypeVarNamespace()
+    deep = fw.Checker.create(tg.Iterable[int]).degrade(3)
+    late = LateX()
+    assert fw.Checker.create(tg.Iterable[int]).check(late, ns)
+    assert not deep.check(late, ns)
+    assert deep.check(iter(late), ns)  # iterators: only a sample
+
+def test_pickle_degraded_typing_checker():
+    ns = fw.TypeVarNamespace()
+    late = [1] * 40 + ["x"] + [1] * 40
+    deep = pickle.loads(pickle.dumps(fw.Checker.create(tg.List[int]).degrade(3)))
+    assert not deep.check(late, ns)
+    pair = pickle.loads(pickle.dumps(fw.Checker.create(tg.Tuple[int, tg.Iterable[int]]).degrade(3)))
+    assert pair.check((1, [1]), ns) and not pair.check((1, LateX()), ns)
+
+def test_profile_checks_of_typing_tree():
+    v = tc.Validator({"items": tg.List[tg.Dict[str, tg.Sequence[int]]]})
+    with tc.profile_checks(v) as profile:
+        assert v.check(dict(items=[dict(a=[1, 2]), dict(b=[3])]))
+    report = profile.report()
+    assert "FixedMappingChecker" in report
+    assert "GenericMetaChecker(typing.List[typing.Dict[str, typing.Sequence[int]]])" in report
+    root = profile.as_dict()[0]
+    assert root["calls"] == 1 and root["children"][0]["calls"] == 1
+
 def test_Sequence_X_int_OK():
     assert foo_Sequence_X_to_Sequence_X([1, 2], 4) == [1, 2, 4]
 
@@ -154,6 +209,41 @@ def test_MyGeneric_OK_and_not_OK():
                 with expected(tc.InputParameterError("")):
                     mygen.append(element2)  # violates X binding
 
+def test_MyGeneric_bindings_with_threads():
+    # bool and int are compatible in either order, so no append may fail
+    # and all orders end with the most general binding:
+    for rounds in range(20):
+        mygen = MyGeneric()
+        failures = []
+        def append_many(element):
+            for i in range(50):
+                try:
+                    mygen.append(element)
+                except tc.InputParameterError:
+                    failures.append(element)
+        threads = [threading.Thread(target=append_many, args=(element,))
+                   for element in (True, 1, False, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert failures == []
+        assert fw.TypeVarNamespace(mygen).binding_of(X) is int
+
+def test_pickle_typing_checkers():
+    values = ([1, 2], ["a"], {"a": [1]}, {"a": ["b"]}, (1, "a"), ("a", 1),
+              MyGeneric("x"), 3, "3")
+    for annotation in (tg.Sequence[int], tg.Mapping[str, tg.List[int]],
+                       tg.Tuple[int, str], tg.Sequence[tg.Union[int, str]],
+                       tg.Iterable[tg.Tuple[int, str]], MyGeneric[str], tg.Any):
+        checker = fw.Checker.create(annotation)
+        checker.prepare()
+        copy = pickle.loads(pickle.dumps(checker))
+        assert type(copy) is type(checker)
+        for value in values:
+            assert (copy.check(value, fw.TypeVarNamespace()) ==
+                    checker.check(value, fw.TypeVarNamespace()))
+
 # TODO: test Generic class with multiple inheritance
 
 ############################################################################
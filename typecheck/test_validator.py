@@ -0,0 +1,57 @@
+import typecheck as tc
+import typecheck.validator as va
+from .testhelper import expected
+
+############################################################################
+
+RECORD = {"id": int, "ts": float, "tags": tc.list_of(str)}
+
+
+def _records(n, bad=()):
+    for i in range(n):
+        if i in bad:
+            yield {"id": str(i), "ts": 1.0, "tags": []}
+        else:
+            yield {"id": i, "ts": 1.0, "tags": ["a", "b"]}
+
+
+def test_Validator_check():
+    v = tc.Validator(RECORD)
+    assert v.check({"id": 1, "ts": 2.0, "tags": []})
+    assert not v.check({"id": 1, "ts": 2.0, "tags": [3]})
+    assert not v.check({"id": 1, "ts": 2.0})
+    assert tc.Validator(tc.optional(int)).check(None)
+
+
+def test_Validator_check_many_and_first_failure():
+    v = tc.Validator(RECORD)
+    assert v.check_many(_records(1000)) == []
+    assert v.check_many(_records(1000, bad={0, 17, 999})) == [0, 17, 999]
+    assert v.first_failure(_records(1000)) is None
+    assert v.first_failure(_records(1000, bad={17, 999})) == 17
+    assert v.check_many([]) == []
+
+
+def test_Validator_invalid_annotation():
+    with expected(tc.TypeCheckSpecificationError("invalid typecheck annotation: 3")):
+        tc.Validator(3)
+
+
+def test_Validator_with_workers():
+    v = tc.Validator(RECORD)
+    records = list(_records(10000, bad={3, 4567, 9999}))
+    assert v.check_many(records, workers=2, chunksize=1000) == [3, 4567, 9999]
+    assert v.first_failure(records, workers=2, chunksize=1000) == 3
+    assert v.first_failure(records[4:], workers=3, chunksize=700) == 4563
+    assert v.first_failure(records[4:4567], workers=2) is None
+    assert v.check_many(_records(3000, bad={2999}), workers=2, chunksize=1000) == [2999]
+    assert tc.Validator(int).first_failure(list(range(5000)) + [None], workers=2) == 5000
+
+
+def test_Validator_with_worker_threads(monkeypatch):
+    # as on Python builds without GIL, which typecheck does not run on yet:
+    monkeypatch.setattr(va, "_gil_is_enabled", lambda: False)
+    v = tc.Validator(lambda value: value != "x")  # not picklable: no processes
+    values = [1] * 5000 + ["x"] + [2] * 100
+    assert v.first_failure(values, workers=2, chunksize=1000) == 5000
+    assert v.check_many(values, workers=3, chunksize=700) == [5000]
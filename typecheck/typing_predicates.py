@@ -1,12 +1,11 @@
-import copy
-import inspect
+import collections.abc
 import typing as tg
 
 import typecheck.framework as fw
 import typecheck.tc_predicates as tcp
 
-_dummy = None  # __init__.py must use from...import to avoid 'typecheck' name clash
-
+# This module is not imported by __init__.py but by fw.Checker.create()
+# as soon as the first annotation shows up that may come from typing.
 # TypeChecker must not apply to the stuff from module typing
 # which all(?) comes under the following types of types.
 # We therefore check for these types separately and register their
@@ -15,30 +14,122 @@ typing_typetypes = [tg.GenericMeta,
                     tg.CallableMeta,
                     tg._ProtocolMeta]
 
-class GenericMetaChecker(fw.Checker):
+
+# Parameterized typing types such as tg.Sequence[int] cannot be pickled,
+# so the checkers for them pickle a description of the annotation instead
+# and are re-created from it by fw.Checker.create() when unpickled.
+
+class _Subscription:
+    """Picklable description of origin[params]; unpickles as the latter."""
+    def __init__(self, origin, params):
+        self.origin = origin
+        self.params = params
+
+    def __reduce__(self):
+        return (_subscribe, (_picklable(self.origin),
+                             tuple(_picklable(p) for p in self.params)))
+
+
+def _subscribe(origin, params):
+    return origin[params]
+
+
+def _picklable(annotation):
+    """annotation itself or, if it does not pickle by reference, a _Subscription."""
+    if type(annotation) == tg.GenericMeta and annotation.__origin__ is not None:
+        return _Subscription(annotation.__origin__, annotation.__parameters__)
+    if type(annotation) == tg.TupleMeta and annotation.__tuple_params__ is not None:
+        ellipsis = (Ellipsis,) if annotation.__tuple_use_ellipsis__ else ()
+        return _Subscription(tg.Tuple, annotation.__tuple_params__ + ellipsis)
+    if type(annotation) == tg.UnionMeta and annotation.__union_params__:
+        return _Subscription(tg.Union, annotation.__union_params__)
+    return annotation
+
+
+class _PickledAsAnnotation:
+    """Mixin for checkers that can be re-created from their annotation self._cls."""
+    _level = 2  # content check level, see degrade()
+
+    def __reduce__(self):
+        if self._level == 2:
+            return (fw.Checker.create, (_picklable(self._cls),))
+        return (_created_at_level, (_picklable(self._cls), self._level))
+
+    def degrade(self, level):
+        result = super().degrade(level)
+        if type(result) is type(self) and result is not self:
+            result._level = level  # (level 1 results pickle via check_class)
+        return result
+
+
+def _created_at_level(annotation, level):
+    return fw.Checker.create(annotation).degrade(level)
+
+
+class GenericMetaChecker(_PickledAsAnnotation, fw.Checker):
+    pure = True
+
     def __init__(self, tg_class):
         self._cls = tg_class
+        self._dispatch = None  # built on first use, see prepare()
 
     def check(self, value, namespace):
         if not self._is_possible_subclass(type(value), self._cls):
             return False  # totally the wrong type
         # now check the content of the value, if possible:
+        if self._dispatch is None:
+            self.prepare()
+        for checkable_class, content_checker in self._dispatch:
+            if isinstance(value, checkable_class):
+                return content_checker.check(value, namespace)
+        # tg.Iterator: nothing is checkable: reading would modify it
+        # tg.Container: nothing is checkable: would need to guess elements
+        return True  # no content checking possible
+
+    def prepare(self):
+        if self._dispatch is None:
+            # threads racing here build equal tables; whichever is stored wins:
+            self._dispatch = tuple(self._dispatch_table())
+        super().prepare()
+
+    def children(self):
+        return [content_checker for c, content_checker in self._dispatch or ()]
+
+    def check_class(self, value):
+        return self._is_possible_subclass(type(value), self._cls)
+
+    def degrade(self, level):
+        self.prepare()  # builds the children
+        if level != 3:
+            return super().degrade(level)
+        result = self._copy()
+        result._dispatch = tuple((checkable_class, content_checker.degrade(level))
+                                 for checkable_class, content_checker in self._dispatch)
+        result._level = level
+        return result
+
+    def _dispatch_table(self):
+        """
+        Yields pairs (checkable_class, content_checker):
+        A value that is an instance of checkable_class gets its content
+        checked by content_checker (the first pair that applies wins).
+        """
         assert type(self._cls) == tg.GenericMeta
         params = self._cls.__parameters__
-        result = True  # any failing check will set it to False
         # check checkable relevant properties of all
         # relevant Generic subclasses from the typing module.
         # Fall back from specific to less specific leave the content
         # check out if there are more __parameters__ than expected:
-        if (self._we_want_to_check(value, tg.Sequence)):
-            return self._check_sequence(value, params, namespace)
-        if (self._we_want_to_check(value, tg.Mapping)):
-            return self._check_mapping(value, params, namespace)
-        if (self._we_want_to_check(value, tg.Iterable)):
-            return self._check_by_iterator(value, params, namespace)
-        # tg.Iterator: nothing is checkable: reading would modify it
-        # tg.Container: nothing is checkable: would need to guess elements
-        return True  # no content checking possible
+        if self._we_want_to_check(tg.Sequence):
+            assert len(params) == 1
+            yield tg.Sequence, tcp.sequence_of(params[0])
+            # TODO: move sequence content checking routine to fw
+        if self._we_want_to_check(tg.Mapping):
+            assert len(params) == 2
+            yield tg.Mapping, tcp.map_of(params[0], params[1])
+        if self._we_want_to_check(tg.Iterable):
+            assert len(params) == 1
+            yield tg.Iterable, IteratorContentChecker(params[0])
 
     def _is_possible_subclass(self, subtype, supertype):
         """
@@ -58,33 +149,47 @@ class GenericMetaChecker(fw.Checker):
                 return True  # TODO: ensure __parameters__ are compatible
         return False  # _cls not found as superclass
 
-    def _we_want_to_check(self, value, checkable_class):
+    def _we_want_to_check(self, checkable_class):
+        """The value-independent part of whether to check as checkable_class."""
         num_parameters = len(checkable_class.__parameters__)
         annotation_is_more_special = self._is_possible_subclass(self._cls, checkable_class)
         annotation_is_less_special = self._is_possible_subclass(checkable_class, self._cls)
         annotation_is_related = (annotation_is_more_special or annotation_is_less_special)
-        return (isinstance(value, checkable_class) and
-                annotation_is_related and
+        return (annotation_is_related and
                 len(self._cls.__parameters__) == num_parameters)
 
-    def _check_by_iterator(self, value, contenttypes, namespace):
-        assert len(contenttypes) == 1
-        checker = fw.Checker.create(contenttypes[0])
+
+class IteratorContentChecker(fw.Checker):
+    """
+    Checks the first few elements an iterable's iterator delivers
+    (at level 3: all of them, unless the iterable is an iterator itself,
+    which checking all elements would use up).
+    """
+    pure = True
+
+    _exhaustive = False  # see degrade()
+
+    def __init__(self, check, checkonly=4):
+        self._check = fw.Checker.create(check)
+        self._checkonly = checkonly  # TODO: make check-amount configurable
+
+    def check(self, value, namespace):
+        checkonly = self._checkonly
+        if self._exhaustive and not isinstance(value, collections.abc.Iterator):
+            checkonly = None
         for i, nextvalue in enumerate(value):
-            if not checker(nextvalue, namespace):
+            if not self._check(nextvalue, namespace):
                 return False
-            if i+1 == 4:  # TODO: make check-amount configurable
+            if i+1 == checkonly:
                 return True  # enough checks done
         return True  # if shorter than check amount
 
-    def _check_mapping(self, value, contenttypes, namespace):
-        assert len(contenttypes) == 2
-        return tcp.map_of(contenttypes[0], contenttypes[1]).check(value, namespace)
-
-    def _check_sequence(self, value, contenttypes, namespace):
-        assert len(contenttypes) == 1
-        return tcp.sequence_of(contenttypes[0]).check(value, namespace)
-        # TODO: move sequence content checking routine to fw
+    def degrade(self, level):
+        if level != 3:
+            return super().degrade(level)
+        result = self._with_degraded_children(level)
+        result._exhaustive = True
+        return result
 
 fw.Checker.register(fw._is_GenericMeta_class, GenericMetaChecker, prepend=True)
 
@@ -93,6 +198,8 @@ def _is_typevar(annotation):
     return type(annotation) == tg.TypeVar
 
 class TypeVarChecker(fw.Checker):
+    pure = False  # depends on the bindings in the namespace
+
     def __init__(self, typevar):
         self.typevar = typevar
 
@@ -110,13 +217,14 @@ fw.Checker.register(_is_typevar, TypeVarChecker, prepend=True)
 
 
 def _is_tg_tuple(annotation):
-    return (inspect.isclass(annotation) and
+    return (fw._isclass(annotation) and
             issubclass(annotation, tg.Tuple) and
             not type(annotation) == tuple)
 
-class TupleChecker(fw.FixedSequenceChecker):
+class TupleChecker(_PickledAsAnnotation, fw.FixedSequenceChecker):
     def __init__(self, tg_tuple_class):
         self._cls = tg_tuple_class
+        self._is_tg_tuple = True
         self._checks = tuple(fw.Checker.create(t) for t in self._cls.__tuple_params__)
 
     # check() is inherited
@@ -125,11 +233,13 @@ fw.Checker.register(_is_tg_tuple, TupleChecker, prepend=True)
 
 
 def _is_tg_namedtuple(annotation):
-    return (inspect.isclass(annotation) and
+    return (fw._isclass(annotation) and
             issubclass(annotation, tuple) and
             getattr(annotation, "_field_types"))
 
 class NamedTupleChecker(fw.Checker):
+    pure = True
+
     def __init__(self, tg_namedtuple_class):
         self._cls = tg_namedtuple_class
         self._checks = tuple(fw.Checker.create(self._cls._field_types[fn])
@@ -147,6 +257,9 @@ class NamedTupleChecker(fw.Checker):
                 return False
         return True
 
+    def check_class(self, value):
+        return issubclass(type(value), self._cls) and len(value) == len(self._cls._fields)
+
 # must be registered after TupleChecker (to be executed before it):
 fw.Checker.register(_is_tg_namedtuple, NamedTupleChecker, prepend=True)
 
@@ -154,7 +267,9 @@ fw.Checker.register(_is_tg_namedtuple, NamedTupleChecker, prepend=True)
 def _is_tg_union(annotation):
     return hasattr(annotation, '__origin__') and annotation.__origin__ is tg.Union
 
-class UnionChecker(fw.Checker):
+class UnionChecker(_PickledAsAnnotation, fw.Checker):
+    pure = True
+
     def __init__(self, tg_union_class):
         self._cls = tg_union_class
         self._checks = tuple(fw.Checker.create(p) for p in self._cls.__args__)
@@ -176,6 +291,8 @@ def _is_string(annotation):
     return type(annotation) == str
 
 class TypeNameChecker(fw.Checker):
+    pure = True
+
     def __init__(self, typename):
         self._typename = typename
 
@@ -194,6 +311,8 @@ def _is_tg_any(annotation):
     return annotation == tg.Any
 
 class AnyChecker(fw.Checker):
+    pure = True
+
     def __init__(self, tg_any_class):
         self._cls = tg_any_class
 
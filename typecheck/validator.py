@@ -0,0 +1,127 @@
+import collections
+import sys
+
+import typecheck.framework as fw
+
+
+class Validator:
+    """
+    Checks values against an annotation outside of function calls,
+    e.g. the records of a data stream:
+        v = tc.Validator({"id": int, "ts": float, "tags": tc.list_of(str)})
+        bad_indices = v.check_many(records)
+    The annotation can be anything @typecheck accepts.
+    Each value is checked independently of the others: type variables
+    bound while checking one value are forgotten before the next.
+    """
+    def __init__(self, annotation):
+        self.annotation = annotation
+        self.checker = fw.Checker.create(annotation)
+        if self.checker is None:
+            raise fw.TypeCheckSpecificationError(
+                "invalid typecheck annotation: {0!r}".format(annotation))
+
+    def check(self, value):
+        """Returns whether value conforms to the annotation."""
+        return bool(self.checker.check(value, fw.TypeVarNamespace()))
+
+    def check_many(self, iterable, workers=None, chunksize=None):
+        """
+        Returns the list of the indices of the non-conforming values.
+        For workers and chunksize, see first_failure().
+        """
+        if not workers:
+            return _failures(self.checker, iterable)
+        return [index
+                for failures in _chunkwise(_failures, self.checker, iterable,
+                                           workers, chunksize, stop_early=False)
+                for index in failures]
+
+    def first_failure(self, iterable, workers=None, chunksize=None):
+        """
+        Returns the index of the first non-conforming value, or None.
+        With workers=N, the values are split into chunks of chunksize
+        values (default: about 100 chunks per worker, at least 1000 values)
+        that are checked by N worker processes or, on Python builds
+        without GIL, threads (untested: such builds start at Python 3.13,
+        which typecheck does not support yet).
+        Worker processes require a picklable annotation.
+        Once a failure is found, no further chunks are checked.
+        """
+        if not workers:
+            return _first_failure(self.checker, iterable)
+        for index in _chunkwise(_first_failure, self.checker, iterable,
+                                workers, chunksize, stop_early=True):
+            if index is not None:
+                return index
+        return None
+
+
+def _failures(checker, iterable, offset=0):
+    check = checker.check
+    namespace = fw.TypeVarNamespace()  # one for all values, see clear()
+    clear = namespace.clear
+    failures = []
+    for index, value in enumerate(iterable, offset):
+        if not check(value, namespace):
+            failures.append(index)
+        clear()
+    return failures
+
+
+def _first_failure(checker, iterable, offset=0):
+    check = checker.check
+    namespace = fw.TypeVarNamespace()
+    clear = namespace.clear
+    for index, value in enumerate(iterable, offset):
+        if not check(value, namespace):
+            return index
+        clear()
+    return None
+
+
+def _chunkwise(function, checker, iterable, workers, chunksize, stop_early):
+    """
+    Yields function(checker, chunk, offset_of_chunk) for the consecutive
+    chunks of iterable, computed in parallel by workers workers.
+    Only a few chunks per worker are submitted ahead, so that the chunks
+    (copies of slices) need not all exist at once and, with stop_early,
+    the remaining ones are not even cut after a true result.
+    """
+    import concurrent.futures  # deferred to keep 'import typecheck' fast
+    if not hasattr(iterable, "__len__") or not hasattr(iterable, "__getitem__"):
+        iterable = list(iterable)
+    if chunksize is None:
+        chunksize = max(1000, len(iterable) // (100 * workers))
+    if _gil_is_enabled():
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+    starts = iter(range(0, len(iterable), chunksize))
+    pending = collections.deque()
+
+    def submit_next():
+        for start in starts:
+            pending.append(executor.submit(function, checker,
+                                           iterable[start:start + chunksize], start))
+            return
+
+    with executor:
+        for i in range(2 * workers):
+            submit_next()
+        try:
+            while pending:
+                result = pending.popleft().result()
+                yield result
+                if stop_early and result is not None:
+                    return
+                submit_next()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _gil_is_enabled():
+    # (always true on the Python versions typecheck currently runs on)
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)  # Python 3.13+
+    return is_gil_enabled is None or is_gil_enabled()